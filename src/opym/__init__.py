@@ -5,50 +5,121 @@ opym: OPM Cropper Package
 
 from __future__ import annotations
 
-# Expose the main functions for library use (e.g., in notebooks)
-from .batch import run_batch_cropping
-from .core import process_dataset, run_processing_job
-from .dataloader import (
-    find_dsr_directory,
-    get_channel_count,
-    load_llsm_tiff_series,
-    load_tiff_series,
-)
-from .metadata import create_processing_log, parse_timestamps, parse_z_step
-from .petakit import (
-    monitor_job_background,
-    run_petakit_processing,
-    submit_crop_and_save_sidecar,
-    submit_remote_crop_job,
-    submit_remote_deskew_job,
-    wait_for_job,
-)
-from .roi_utils import (
-    align_rois,
-    load_rois_from_log,
-    process_rois_from_selector,
-    save_rois_to_log,
-)
-from .ui import create_crop_settings_ui, create_deskew_ui
-from .utils import (
-    DerivedPaths,
-    MicroscopyDataType,
-    OutputFormat,
-    derive_paths,
-    detect_microscopy_data_type,
-    parse_roi_string,
-    scan_channel_patterns,
-)
-from .viewer import (
-    composite_viewer,
-    create_mip,
-    interactive_roi_selector,
-    single_channel_viewer,
-    visualize_alignment,
-)
+import importlib
+from typing import TYPE_CHECKING, Any
 
-# New PSF and Decon Widgets
-from .widgets import DeconvolutionViewer, PSFAverager, PSFExtractor
+# Expose the main functions for library use (e.g., in notebooks).
+# Each name is imported from its submodule on first access (PEP 562), so
+# `import opym` (the CLI, the GPU watchdog) does not pull in matplotlib,
+# ipywidgets or scikit-image until a notebook actually uses them.
+_LAZY_EXPORTS = {
+    "run_batch_cropping": ".batch",
+    "process_dataset": ".core",
+    "run_processing_job": ".core",
+    "find_dsr_directory": ".dataloader",
+    "get_channel_count": ".dataloader",
+    "load_llsm_tiff_series": ".dataloader",
+    "load_tiff_series": ".dataloader",
+    "create_processing_log": ".metadata",
+    "parse_timestamps": ".metadata",
+    "parse_z_step": ".metadata",
+    "monitor_job_background": ".petakit",
+    "run_petakit_processing": ".petakit",
+    "submit_crop_and_save_sidecar": ".petakit",
+    "submit_remote_crop_job": ".petakit",
+    "submit_remote_deskew_job": ".petakit",
+    "submit_remote_crop_deskew_job": ".petakit",
+    "wait_for_job": ".petakit",
+    "wait_for_job_async": ".petakit",
+    "align_rois": ".roi_utils",
+    "load_rois_from_log": ".roi_utils",
+    "process_rois_from_selector": ".roi_utils",
+    "save_rois_to_log": ".roi_utils",
+    "create_crop_settings_ui": ".ui",
+    "create_deskew_ui": ".ui",
+    "DerivedPaths": ".utils",
+    "MicroscopyDataType": ".utils",
+    "OutputFormat": ".utils",
+    "derive_paths": ".utils",
+    "detect_microscopy_data_type": ".utils",
+    "parse_roi_string": ".utils",
+    "scan_channel_patterns": ".utils",
+    "composite_viewer": ".viewer",
+    "create_mip": ".viewer",
+    "interactive_roi_selector": ".viewer",
+    "single_channel_viewer": ".viewer",
+    "visualize_alignment": ".viewer",
+    "DeconvolutionViewer": ".widgets",
+    "PSFAverager": ".widgets",
+    "PSFExtractor": ".widgets",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        # Submodules stay reachable as attributes, e.g. `opym.petakit`
+        try:
+            return importlib.import_module(f".{name}", __name__)
+        except ModuleNotFoundError as e:
+            if e.name != f"{__name__}.{name}":
+                raise
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
+
+
+if TYPE_CHECKING:
+    from .batch import run_batch_cropping
+    from .core import process_dataset, run_processing_job
+    from .dataloader import (
+        find_dsr_directory,
+        get_channel_count,
+        load_llsm_tiff_series,
+        load_tiff_series,
+    )
+    from .metadata import create_processing_log, parse_timestamps, parse_z_step
+    from .petakit import (
+        monitor_job_background,
+        run_petakit_processing,
+        submit_crop_and_save_sidecar,
+        submit_remote_crop_deskew_job,
+        submit_remote_crop_job,
+        submit_remote_deskew_job,
+        wait_for_job,
+        wait_for_job_async,
+    )
+    from .roi_utils import (
+        align_rois,
+        load_rois_from_log,
+        process_rois_from_selector,
+        save_rois_to_log,
+    )
+    from .ui import create_crop_settings_ui, create_deskew_ui
+    from .utils import (
+        DerivedPaths,
+        MicroscopyDataType,
+        OutputFormat,
+        derive_paths,
+        detect_microscopy_data_type,
+        parse_roi_string,
+        scan_channel_patterns,
+    )
+    from .viewer import (
+        composite_viewer,
+        create_mip,
+        interactive_roi_selector,
+        single_channel_viewer,
+        visualize_alignment,
+    )
+
+    # New PSF and Decon Widgets
+    from .widgets import DeconvolutionViewer, PSFAverager, PSFExtractor
 
 __all__ = [
     "process_dataset",
@@ -73,11 +144,13 @@ __all__ = [
     "visualize_alignment",
     "submit_remote_crop_job",
     "submit_remote_deskew_job",
+    "submit_remote_crop_deskew_job",
     "monitor_job_background",
     "run_petakit_processing",
     "detect_microscopy_data_type",
     "MicroscopyDataType",
     "wait_for_job",
+    "wait_for_job_async",
     "run_batch_cropping",
     "create_crop_settings_ui",
     "create_deskew_ui",
@@ -0,0 +1,88 @@
+# Ruff style: Compliant
+"""
+JSON helpers that use orjson when it is installed, falling back to the stdlib.
+
+Both paths work on UTF-8 bytes so callers can pair them with
+Path.read_bytes() / Path.write_bytes() and a single read or write syscall.
+Output is always pure ASCII (non-ASCII escaped as \\uXXXX, as json.dumps does
+by default): the Matlab readers decode ticket bytes one char per byte.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any
+
+try:
+    import orjson
+
+    # Match what json.dumps accepts here: numpy scalars/arrays from ROI and
+    # timestamp math, and int dict keys
+    _ORJSON_OPTS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+except ImportError:  # Optional: install with `uv pip install -e .[fast]`
+    orjson = None
+
+_NON_ASCII_RE = re.compile(r"[^\x00-\x7f]")
+
+
+def _escape_char(match: re.Match[str]) -> str:
+    """JSON-escapes one non-ASCII character (surrogate pair above the BMP)."""
+    code = ord(match.group())
+    if code < 0x10000:
+        return f"\\u{code:04x}"
+    code -= 0x10000
+    return f"\\u{0xD800 + (code >> 10):04x}\\u{0xDC00 + (code & 0x3FF):04x}"
+
+
+def loads(data: bytes | str) -> Any:
+    """
+    Parses a JSON document from bytes or str. Documents orjson rejects are
+    retried with the stdlib, which also accepts NaN/Infinity literals (as
+    found in some Micro-Manager metadata); real syntax errors still raise
+    json.JSONDecodeError.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """
+    Serializes obj to UTF-8 JSON bytes, pretty-printed with 2 spaces if indent.
+
+    With orjson, NaN and +/-Infinity floats are written as null (strict JSON),
+    where the stdlib fallback writes NaN/Infinity literals.
+    """
+    if orjson is not None:
+        option = _ORJSON_OPTS | (orjson.OPT_INDENT_2 if indent else 0)
+        data = orjson.dumps(obj, option=option)
+        if data.isascii():  # Common case: nothing to escape
+            return data
+        # orjson has no ensure_ascii; non-ASCII only occurs inside strings
+        return _NON_ASCII_RE.sub(_escape_char, data.decode()).encode("ascii")
+    return json.dumps(obj, indent=2 if indent else None).encode()
+
+
+def write_atomic(data: bytes, path: Path) -> None:
+    """
+    Writes data to path via a temporary sibling and os.replace(), so
+    readers never see a half-written file even if this process is killed.
+    """
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def dump_atomic(obj: Any, path: Path, indent: bool = False) -> None:
+    """Atomically writes obj as JSON to path (see write_atomic)."""
+    write_atomic(dumps(obj, indent=indent), path)
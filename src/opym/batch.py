@@ -2,10 +2,15 @@
 opym.batch - Orchestration logic for batch processing workflows.
 """
 
+from __future__ import annotations
+
 import time
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-import ipywidgets as widgets
+if TYPE_CHECKING:
+    # Only needed for annotations; the widgets are created by the caller
+    import ipywidgets as widgets
 
 # Intra-package imports
 from . import metadata, petakit
@@ -68,36 +73,15 @@ def run_batch_cropping(
     psf_file = decon.get("psf_source") if decon else None
     n_iters = decon.get("iterations") if decon else None
 
-    # Store active jobs: (filename, crop_ticket_path, deskew_ticket_path)
-    active_jobs: list[tuple[str, Path, Path]] = []
+    # Store active jobs: (filename, crop+deskew ticket path)
+    active_jobs: list[tuple[str, Path]] = []
 
     # --- 2. Submission Phase ---
     with log_output:
         for i, file_path in enumerate(file_list):
             status_label.value = f"Submitting {i + 1}/{len(file_list)}..."
             try:
-                # A. Submit Crop
-                crop_ticket = petakit.submit_remote_crop_job(
-                    base_file=file_path,
-                    top_roi=top_roi,
-                    bottom_roi=bot_roi,
-                    channels=channels,
-                    output_format=fmt,
-                    rotate=rotate,
-                )
-
-                # B. Prepare Deskew Target
-                # Logic to clean filename
-                if file_path.name.endswith(".ome.tif"):
-                    clean_name = file_path.name[:-8]
-                elif file_path.name.endswith(".tif"):
-                    clean_name = file_path.name[:-4]
-                else:
-                    clean_name = file_path.stem
-
-                target_dir = file_path.parent / clean_name
-
-                # C. Detect Z-Step (or use default)
+                # A. Detect Z-Step (or use default)
                 z_step = default_z
                 meta_file = file_path.parent / "AcqSettings.txt"
                 if meta_file.exists():
@@ -106,19 +90,25 @@ def run_batch_cropping(
                     except Exception:  # nosec
                         pass  # Keep default
 
-                # D. Submit Deskew
-                deskew_ticket = petakit.submit_remote_deskew_job(
-                    input_target=target_dir,
+                # B. Submit Crop + Deskew as one ticket, so the deskew runs
+                # on the same worker right after its crop output exists
+                ticket = petakit.submit_remote_crop_deskew_job(
+                    base_file=file_path,
+                    top_roi=top_roi,
+                    bottom_roi=bot_roi,
                     z_step_um=z_step,
+                    channels=channels,
+                    output_format=fmt,
+                    rotate=rotate,
                     xy_pixel_size=default_pixel,
+                    verbose=False,  # Summarized below as "[i] Submitted"
                     sheet_angle_deg=default_angle,
                     deskew=True,
-                    rotate=True,
                     psf_path=psf_file,
                     n_iters=n_iters,
                 )
 
-                active_jobs.append((file_path.name, crop_ticket, deskew_ticket))
+                active_jobs.append((file_path.name, ticket))
                 print(f"[{i + 1}] Submitted: {file_path.name}")
 
             except Exception as e:
@@ -138,20 +128,13 @@ def run_batch_cropping(
 
     try:
         while len(completed_indices) < len(active_jobs):
-            for idx, (name, ct, dt) in enumerate(active_jobs):
+            for idx, (name, ticket) in enumerate(active_jobs):
                 if idx in completed_indices:
                     continue
 
                 # Check Queue Status
                 # Logic: If ticket GONE from queue folder -> Started/Done
-                base_queue = dt.parent.parent / "queue"
-
-                # We check if EITHER ticket is still present
-                in_queue = (base_queue / dt.name).exists() or (
-                    base_queue / ct.name
-                ).exists()
-
-                if not in_queue:
+                if not ticket.exists():
                     completed_indices.add(idx)
                     progress_bar.value += 1
                     with log_output:
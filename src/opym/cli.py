@@ -62,7 +62,10 @@ def main():
         "--roi-from-log",
         type=Path,
         default=None,
-        help="Path to a JSON log file containing ROIs (e.g., 'opm_roi_log.json').",
+        help=(
+            "Path to the ROI log file written by opym (e.g., 'opm_roi_log.jsonl'); "
+            "a legacy 'opm_roi_log.json' next to it is still read."
+        ),
     )
 
     parser.add_argument(
@@ -234,7 +237,7 @@ def main():
                 top_roi=top_roi,
                 bottom_roi=bottom_roi,
                 output_format=output_format,
-                cli_log_file=args.roi_from_log or Path("opm_roi_log.json"),
+                cli_log_file=args.roi_from_log or Path("opm_roi_log.jsonl"),
                 rotate_90=args.rotate,
                 channels_to_output=channels_to_output,
             )
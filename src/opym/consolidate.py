@@ -8,12 +8,13 @@ into a single OME-NGFF v0.4 store without copying any data — only hardlinks
 
 from __future__ import annotations
 
-import json
 import os
 import re
 import time
 from pathlib import Path
 
+from ._jsonio import dumps, loads
+
 
 def consolidate_to_ome_zarr(
     decon_dir: Path,
@@ -56,8 +57,7 @@ def consolidate_to_ome_zarr(
     if not zarray_src_path.exists():
         print(f"[consolidate] ERROR: {zarray_src_path} not found — invalid zarr array")
         return False
-    with open(zarray_src_path) as f:
-        src_meta = json.load(f)
+    src_meta = loads(zarray_src_path.read_bytes())
 
     zyx_shape: list[int] = src_meta["shape"]
     zyx_chunks: list[int] = src_meta["chunks"]
@@ -70,7 +70,7 @@ def consolidate_to_ome_zarr(
     arr_path = out_path / "0"
     arr_path.mkdir(parents=True, exist_ok=True)
 
-    (out_path / ".zgroup").write_text(json.dumps({"zarr_format": 2}))
+    (out_path / ".zgroup").write_bytes(dumps({"zarr_format": 2}))
 
     # 5D array: chunks [1, 1, Z, Y, X] so every T×C source maps to exactly one
     # "super-chunk" and file names iz.iy.ix → t.c.iz.iy.ix require no reshaping.
@@ -84,7 +84,7 @@ def consolidate_to_ome_zarr(
         "order": src_meta.get("order", "C"),
         "filters": src_meta.get("filters"),
     }
-    (arr_path / ".zarray").write_text(json.dumps(zarray_5d))
+    (arr_path / ".zarray").write_bytes(dumps(zarray_5d))
 
     n_linked = 0
     use_symlinks = False
@@ -114,7 +114,7 @@ def consolidate_to_ome_zarr(
     # OME-NGFF v0.4. After DSR the output is ~isotropic at xy_pixel_um in all
     # three spatial dimensions; z_step_um describes the pre-DSR raw data only.
     ch_labels = channel_names if len(channel_names) == num_c else [f"C{c}" for c in all_c]
-    (out_path / ".zattrs").write_text(json.dumps({
+    (out_path / ".zattrs").write_bytes(dumps({
         "multiscales": [{
             "version": "0.4",
             "name": base_name,
@@ -141,7 +141,7 @@ def consolidate_to_ome_zarr(
                 )
             ]
         },
-    }, indent=2))
+    }, indent=True))
 
     link_type = "symlinks" if use_symlinks else "hardlinks"
     print(f"[consolidate] Done: {out_path} ({n_linked} chunks via {link_type})")
@@ -168,8 +168,7 @@ def run_pending_consolidations(base_dir: Path) -> int:
             continue
         for ticket in ticket_dir.glob("*.json"):
             try:
-                with open(ticket) as f:
-                    payload = json.load(f)
+                payload = loads(ticket.read_bytes())
                 data_dir = payload.get("dataDir")
                 if data_dir:
                     data_dirs.add(Path(data_dir))
@@ -183,8 +182,7 @@ def run_pending_consolidations(base_dir: Path) -> int:
             continue
 
         try:
-            with open(sidecar) as f:
-                params = json.load(f)
+            params = loads(sidecar.read_bytes())
         except Exception as e:
             print(f"[consolidate] Failed to read sidecar {sidecar}: {e}")
             continue
@@ -8,6 +8,7 @@ from __future__ import annotations
 
 import os
 import shutil
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from typing import cast
 
@@ -31,6 +32,27 @@ def _get_crop_shape(
     return dummy_plane[roi[0], roi[1]].shape
 
 
+def _write_tiff_timepoint(
+    output_dir: Path,
+    sanitized_name: str,
+    t: int,
+    stacks: dict[int, np.ndarray],
+) -> None:
+    """Writes one timepoint's ZYX stacks as '<name>_C{c}_T{t:03d}.tif' files."""
+    # Uncompressed, contiguous strips. PetaKit5D's TIFF reader is strip-based,
+    # so tiles/BigTIFF would slow ingest.
+    for c_out, stack_data in stacks.items():
+        out_name = f"{sanitized_name}_C{c_out}_T{t:03d}.tif"
+        tifffile.imwrite(
+            output_dir / out_name,
+            stack_data,
+            imagej=True,
+            metadata={"axes": "ZYX"},
+            photometric="minisblack",
+            compression=None,
+        )
+
+
 def process_dataset(
     base_file: Path,
     output_dir: Path,
@@ -248,83 +270,107 @@ def process_dataset(
 
         elif output_format == OutputFormat.TIFF_SERIES:
             output_stack_shape_3d = (Z, Y_out, X_out)
-            tif_meta = {"axes": "ZYX"}
 
-            for t in tqdm(range(T), desc=" ├ Streaming & Writing", unit="TP"):
-                # Initialize ONLY requested stacks
-                stacks_to_write = {
-                    c_out: np.zeros(output_stack_shape_3d, dtype=dtype)
+            # Encode/write timepoint t on a background thread while t+1 is read
+            # and cropped. At most one timepoint is in flight to bound memory.
+            # Two reusable buffer sets (ONLY requested stacks) alternate between
+            # the timepoint being filled and the one being written, instead of
+            # allocating fresh stacks every timepoint. Every plane of a requested
+            # stack is overwritten each timepoint, so reuse needs no re-zeroing.
+            # Buffers use native byte order: a big-endian source is swapped once
+            # per plane on copy-in, so imwrite can stream the buffer as-is.
+            native_dtype = dtype.newbyteorder("=")
+            if native_dtype != dtype:
+                print(f"  Info: Converting {dtype.str} input to native byte order.")
+            buffer_sets = [
+                {
+                    c_out: np.zeros(output_stack_shape_3d, dtype=native_dtype)
                     for c_out in channels_to_output
                 }
+                for _ in range(min(T, 2))
+            ]
 
-                for z in range(Z):
-                    # Iterate Excitations
-                    for exc in range(n_excitations):
-                        cam0_idx = exc * 2
-                        cam1_idx = exc * 2 + 1
-                        out_base = exc * 4
-
-                        if ndim == 5:
-                            plane_cam0 = cast(np.ndarray, zarr_array[t, z, cam0_idx])
-                            plane_cam1 = cast(np.ndarray, zarr_array[t, z, cam1_idx])
-                        else:
-                            plane_cam0 = cast(np.ndarray, zarr_array[z, cam0_idx])
-                            plane_cam1 = cast(np.ndarray, zarr_array[z, cam1_idx])
-
-                        # Cam 0 - Bottom (ID + 0)
-                        if (out_base + 0) in channels_to_output:
-                            b_roi = cast(tuple[slice, slice], bottom_roi)
-                            crop = plane_cam0[b_roi[0], b_roi[1]]
-                            if rotate_90:
-                                stacks_to_write[out_base + 0][z, :, :] = np.rot90(
-                                    crop, k=1
-                                )
-                            else:
-                                stacks_to_write[out_base + 0][z, :, :] = crop
+            with ThreadPoolExecutor(max_workers=1) as writer:
+                pending: Future[None] | None = None
+                for t in tqdm(range(T), desc=" ├ Streaming & Writing", unit="TP"):
+                    # Safe to refill: the write of t-2 finished before t-1 was queued
+                    stacks_to_write = buffer_sets[t % 2]
 
-                        # Cam 0 - Top (ID + 1)
-                        if (out_base + 1) in channels_to_output:
-                            t_roi = cast(tuple[slice, slice], top_roi)
-                            crop = plane_cam0[t_roi[0], t_roi[1]]
-                            if rotate_90:
-                                stacks_to_write[out_base + 1][z, :, :] = np.rot90(
-                                    crop, k=1
-                                )
-                            else:
-                                stacks_to_write[out_base + 1][z, :, :] = crop
+                    for z in range(Z):
+                        # Iterate Excitations
+                        for exc in range(n_excitations):
+                            cam0_idx = exc * 2
+                            cam1_idx = exc * 2 + 1
+                            out_base = exc * 4
 
-                        # Cam 1 - Top (ID + 2)
-                        if (out_base + 2) in channels_to_output:
-                            t_roi = cast(tuple[slice, slice], top_roi)
-                            crop = plane_cam1[t_roi[0], t_roi[1]]
-                            if rotate_90:
-                                stacks_to_write[out_base + 2][z, :, :] = np.rot90(
-                                    crop, k=1
+                            if ndim == 5:
+                                plane_cam0 = cast(
+                                    np.ndarray, zarr_array[t, z, cam0_idx]
                                 )
-                            else:
-                                stacks_to_write[out_base + 2][z, :, :] = crop
-
-                        # Cam 1 - Bottom (ID + 3)
-                        if (out_base + 3) in channels_to_output:
-                            b_roi = cast(tuple[slice, slice], bottom_roi)
-                            crop = plane_cam1[b_roi[0], b_roi[1]]
-                            if rotate_90:
-                                stacks_to_write[out_base + 3][z, :, :] = np.rot90(
-                                    crop, k=1
+                                plane_cam1 = cast(
+                                    np.ndarray, zarr_array[t, z, cam1_idx]
                                 )
                             else:
-                                stacks_to_write[out_base + 3][z, :, :] = crop
-
-                # Write TIFFs
-                for c_out, stack_data in stacks_to_write.items():
-                    out_name = f"{sanitized_name}_C{c_out}_T{t:03d}.tif"
-                    tifffile.imwrite(
-                        output_dir / out_name,
-                        stack_data,
-                        imagej=True,
-                        metadata=tif_meta,
+                                plane_cam0 = cast(np.ndarray, zarr_array[z, cam0_idx])
+                                plane_cam1 = cast(np.ndarray, zarr_array[z, cam1_idx])
+
+                            # Cam 0 - Bottom (ID + 0)
+                            if (out_base + 0) in channels_to_output:
+                                b_roi = cast(tuple[slice, slice], bottom_roi)
+                                crop = plane_cam0[b_roi[0], b_roi[1]]
+                                if rotate_90:
+                                    stacks_to_write[out_base + 0][z, :, :] = np.rot90(
+                                        crop, k=1
+                                    )
+                                else:
+                                    stacks_to_write[out_base + 0][z, :, :] = crop
+
+                            # Cam 0 - Top (ID + 1)
+                            if (out_base + 1) in channels_to_output:
+                                t_roi = cast(tuple[slice, slice], top_roi)
+                                crop = plane_cam0[t_roi[0], t_roi[1]]
+                                if rotate_90:
+                                    stacks_to_write[out_base + 1][z, :, :] = np.rot90(
+                                        crop, k=1
+                                    )
+                                else:
+                                    stacks_to_write[out_base + 1][z, :, :] = crop
+
+                            # Cam 1 - Top (ID + 2)
+                            if (out_base + 2) in channels_to_output:
+                                t_roi = cast(tuple[slice, slice], top_roi)
+                                crop = plane_cam1[t_roi[0], t_roi[1]]
+                                if rotate_90:
+                                    stacks_to_write[out_base + 2][z, :, :] = np.rot90(
+                                        crop, k=1
+                                    )
+                                else:
+                                    stacks_to_write[out_base + 2][z, :, :] = crop
+
+                            # Cam 1 - Bottom (ID + 3)
+                            if (out_base + 3) in channels_to_output:
+                                b_roi = cast(tuple[slice, slice], bottom_roi)
+                                crop = plane_cam1[b_roi[0], b_roi[1]]
+                                if rotate_90:
+                                    stacks_to_write[out_base + 3][z, :, :] = np.rot90(
+                                        crop, k=1
+                                    )
+                                else:
+                                    stacks_to_write[out_base + 3][z, :, :] = crop
+
+                    if pending is not None:
+                        pending.result()  # Re-raises any write error
+                    pending = writer.submit(
+                        _write_tiff_timepoint,
+                        output_dir,
+                        sanitized_name,
+                        t,
+                        stacks_to_write,
                     )
 
+                if pending is not None:
+                    pending.result()
+
             print(f"✅ Saved {T * C_new} TIFF files to {output_dir.name}")
 
         else:
@@ -343,7 +389,7 @@ def run_processing_job(
     bottom_roi: tuple[slice, slice] | None,
     output_format: OutputFormat,
     channels_to_output: list[int],
-    cli_log_file: Path = Path("opm_roi_log.json"),
+    cli_log_file: Path = Path("opm_roi_log.jsonl"),
     rotate_90: bool = False,
 ):
     """
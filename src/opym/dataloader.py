@@ -6,13 +6,63 @@ Parses a directory of 3D TIFFs to prepare them for viewing.
 
 from __future__ import annotations
 
+import fnmatch
 import functools
+import os
 import re
 from pathlib import Path
 
 import numpy as np
 import tifffile
 
+# LLSM: (base_name)_Cam(A/B)_ch(c)_stack(t)...tif
+_LLSM_FILE_RE = re.compile(
+    r"^(.*?)_Cam([AB])_ch(\d+)_stack(\d+).*?\.tif$", re.IGNORECASE
+)
+# Processed OPM: (base_name)_C(c)_T(t).tif
+_OPM_FILE_RE = re.compile(r"^(.*?)_C(\d+)_T(\d+)\.tif$", re.IGNORECASE)
+# Micro-Manager continuation chunks: name_1.ome.tif, name_2.ome.tif, ...
+_OME_CHUNK_RE = re.compile(r"_\d+\.ome\.tif$")
+# Channel count in the first page's OME-XML header
+_OME_SIZE_C_RE = re.compile(r'\bSizeC="(\d+)"')
+# Same match as directory.glob("*_C*_T*.tif")
+_PROCESSED_GLOB_RE = re.compile(fnmatch.translate("*_C*_T*.tif"))
+
+
+def _read_stack(file_path: Path) -> np.ndarray:
+    """
+    Reads a TIFF stack into memory. Uncompressed, contiguous files (as written
+    by opym and PetaKit5D) are copied straight from a memory map, skipping the
+    decoder; anything else falls back to tifffile.imread.
+    """
+    try:
+        mm = tifffile.memmap(file_path, mode="r")
+    except ValueError:  # Compressed or not memory-mappable
+        return tifffile.imread(file_path)
+    # Native byte order, as imread returns: big-endian files are swapped
+    # during the copy rather than handed on as '>u2' arrays
+    stack = np.empty(mm.shape, dtype=mm.dtype.newbyteorder("="))
+    np.copyto(stack, mm)
+    del mm
+    return stack
+
+
+def _scan_tiff_series(directory: Path) -> tuple[list[Path], list[Path]]:
+    """
+    Lists a directory once, returning sorted processed ('*_C*_T*.tif') and
+    raw ('*.ome.tif') files. Replaces two glob() calls, each of which would
+    re-read the directory.
+    """
+    processed, raw = [], []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            name = entry.name
+            if _PROCESSED_GLOB_RE.match(name):
+                processed.append(directory / name)
+            if name.endswith(".ome.tif"):
+                raw.append(directory / name)
+    return sorted(processed), sorted(raw)
+
 
 def load_llsm_tiff_series(directory: Path):
     """
@@ -31,14 +81,8 @@ def load_llsm_tiff_series(directory: Path):
     base_name = None
     first_file = None
 
-    # Regex for LLSM: (base_name)_Cam(A/B)_ch(c)_stack(t)...tif
-    file_pattern = re.compile(
-        r"^(.*?)_Cam([AB])_ch(\d+)_stack(\d+).*?\.tif$",
-        re.IGNORECASE,
-    )
-
     for f in directory.glob("*_Cam*_ch*_stack*.tif"):
-        match = file_pattern.match(f.name)
+        match = _LLSM_FILE_RE.match(f.name)
         if match:
             if base_name is None:
                 base_name = match.group(1)
@@ -82,7 +126,7 @@ def load_llsm_tiff_series(directory: Path):
     C_max = max(c_vals)
 
     # Use the first_file we already found
-    first_stack = tifffile.imread(first_file)
+    first_stack = _read_stack(first_file)
     Z_max, Y, X = first_stack.shape
     Z_max -= 1  # Max index is shape - 1
 
@@ -94,10 +138,13 @@ def load_llsm_tiff_series(directory: Path):
     def get_stack(t, c):
         """Loads a 3D ZYX stack for a given T and C."""
         file_path = file_map.get((t, c))
-        if not file_path or not file_path.exists():
-            print(f"Warning: File not found for T={t}, C={c}")
-            return np.zeros((Z_max + 1, Y, X), dtype=first_stack.dtype)
-        return tifffile.imread(file_path)
+        if file_path:
+            try:  # Open directly rather than stat first; files rarely vanish
+                return _read_stack(file_path)
+            except FileNotFoundError:
+                pass
+        print(f"Warning: File not found for T={t}, C={c}")
+        return np.zeros((Z_max + 1, Y, X), dtype=first_stack.dtype)
 
     print("✅ LLSM Data loaded.")
 
@@ -119,12 +166,11 @@ def load_tiff_series(directory: Path):
     if not directory.is_dir():
         raise FileNotFoundError(f"Directory not found: {directory}")
 
-    # 1. Flexible Glob
-    files = sorted(list(directory.glob("*_C*_T*.tif")))
+    # 1. Flexible Glob (processed series and raw OME-TIFFs in one listing)
+    files, ome_files = _scan_tiff_series(directory)
 
     if not files:
         # Check for Raw OME-TIFF files (Micro-Manager)
-        ome_files = sorted(list(directory.glob("*.ome.tif")))
         if ome_files:
             print("Detected raw OME-TIFF data format.")
             import zarr
@@ -132,7 +178,7 @@ def load_tiff_series(directory: Path):
             # Find the base file (usually without _1, _2 suffixes)
             base_file = None
             for f in ome_files:
-                if not re.search(r"_\d+\.ome\.tif$", f.name):
+                if not _OME_CHUNK_RE.search(f.name):
                     base_file = f
                     break
 
@@ -200,8 +246,6 @@ def load_tiff_series(directory: Path):
         )
 
     # 2. Flexible Regex
-    file_pattern_re = re.compile(r"^(.*?)_C(\d+)_T(\d+)\.tif$", re.IGNORECASE)
-
     raw_matches = []
     base_name = None
     first_file = None
@@ -209,7 +253,7 @@ def load_tiff_series(directory: Path):
     print(f"Scanning {len(files)} files...")
 
     for f in files:
-        match = file_pattern_re.match(f.name)
+        match = _OPM_FILE_RE.match(f.name)
         if match:
             if base_name is None:
                 base_name = match.group(1)
@@ -261,7 +305,7 @@ def load_tiff_series(directory: Path):
     C_max = max(c_vals)
 
     # Get dimensions from the first valid file
-    first_stack = tifffile.imread(first_file)
+    first_stack = _read_stack(first_file)
     if len(first_stack.shape) == 2:
         Z_max = 0
         Y, X = first_stack.shape
@@ -277,12 +321,13 @@ def load_tiff_series(directory: Path):
     def get_stack(t, c):
         """Loads a 3D ZYX stack using the pre-built file map (0-based keys)."""
         file_path = file_map.get((t, c))
-
-        if not file_path or not file_path.exists():
-            print(f"Warning: Frame missing for T={t}, C={c}")
-            return np.zeros((Z_max + 1, Y, X), dtype=first_stack.dtype)
-
-        return tifffile.imread(file_path)
+        if file_path:
+            try:  # Open directly rather than stat first; files rarely vanish
+                return _read_stack(file_path)
+            except FileNotFoundError:
+                pass
+        print(f"Warning: Frame missing for T={t}, C={c}")
+        return np.zeros((Z_max + 1, Y, X), dtype=first_stack.dtype)
 
     print("✅ OPM Data loaded.")
 
@@ -334,6 +379,12 @@ def get_channel_count(file_path: Path) -> int:
         import tifffile
 
         with tifffile.TiffFile(file_path) as tif:
+            # The OME header states SizeC directly; building series[0] would
+            # walk every IFD (and every file of a split dataset).
+            if tif.is_ome:
+                match = _OME_SIZE_C_RE.search(tif.pages[0].description)
+                if match:
+                    return int(match.group(1))
             shape = tif.series[0].shape
             # (T, C, Z, Y, X) or (C, Z, Y, X)
             if len(shape) == 5:
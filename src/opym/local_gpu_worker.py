@@ -9,6 +9,8 @@ from __future__ import annotations
 
 import os
 import subprocess  # nosec B404
+import sys
+import threading
 import time
 import shutil
 from pathlib import Path
@@ -32,6 +34,65 @@ def _ensure_directories():
         directory.mkdir(parents=True, exist_ok=True)
 
 
+def _drain_output(proc: subprocess.Popen, label: str):
+    """Forwards a server's output line by line, keeping the pipe drained."""
+    assert proc.stdout is not None  # nosec B101
+    for line in proc.stdout:
+        try:
+            sys.stdout.write(f"[{label}] {line}")
+        except UnicodeEncodeError:  # e.g. an ASCII-only log; never kill the drain
+            sys.stdout.write(
+                f"[{label}] {line}".encode("ascii", "backslashreplace").decode()
+            )
+        sys.stdout.flush()
+
+
+def _launch_server(cmd: list[str], env: dict, label: str):
+    """
+    Starts a Matlab server with its output on a line-buffered pipe.
+    A background thread streams the pipe so Matlab never blocks on a full buffer
+    when the watchdog's own stdout is redirected (e.g. Slurm log files).
+    """
+    proc = subprocess.Popen(  # nosec B603
+        cmd,
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        bufsize=1,
+        # Matlab prints emoji; decode as UTF-8 and never raise, or the drain
+        # thread would die and leave Matlab blocked on a full pipe
+        encoding="utf-8",
+        errors="replace",
+    )
+    reader = threading.Thread(target=_drain_output, args=(proc, label), daemon=True)
+    reader.start()
+    return proc, reader
+
+
+def _build_server_envs(idle_timeout_sec: int) -> tuple[dict, dict]:
+    """
+    Builds the environment for each Matlab server from a single snapshot
+    of os.environ, so the watchdog loop does not re-copy it on every wake-up.
+    """
+    # Pass the timeout to Matlab via environment variables
+    env = os.environ.copy()
+    env["PETAKIT_IDLE_TIMEOUT"] = str(idle_timeout_sec)
+
+    env1 = env.copy()
+    env1["PETAKIT_SERVER_ID"] = "1"
+    env1["PETAKIT_GPU_ID"] = "1"
+    env1["CUDA_VISIBLE_DEVICES"] = "0"
+    env1["PETAKIT_CPUS"] = "10"  # Limit workers to prevent GPU OOM
+
+    env2 = env.copy()
+    env2["PETAKIT_SERVER_ID"] = "2"
+    env2["PETAKIT_GPU_ID"] = "1"  # Both use GPU index 1 because CUDA restricts visibility to 1 device
+    env2["CUDA_VISIBLE_DEVICES"] = "1"
+    env2["PETAKIT_CPUS"] = "10"  # Limit workers to prevent GPU OOM
+
+    return env1, env2
+
+
 def process_queue(idle_timeout_sec: int = 300, poll_interval: int = 2):
     """
     Watches the queue. If jobs exist, launches the persistent Matlab server.
@@ -49,9 +110,12 @@ def process_queue(idle_timeout_sec: int = 300, poll_interval: int = 2):
     print("=" * 60)
     print("👀 Listening for incoming jobs...\n")
 
-    # Pass the timeout to Matlab via environment variables
-    env = os.environ.copy()
-    env["PETAKIT_IDLE_TIMEOUT"] = str(idle_timeout_sec)
+    # Server environments and launch command are fixed for the watchdog's lifetime
+    env1, env2 = _build_server_envs(idle_timeout_sec)
+
+    # Use bash to load the matlab module so licensing works correctly
+    cmd_str = f"module load matlab/R2024b && matlab -nodisplay -sd {OPYM_DIR} -batch run_petakit_server"
+    cmd = ["bash", "-c", cmd_str]
 
     try:
         while True:
@@ -59,33 +123,19 @@ def process_queue(idle_timeout_sec: int = 300, poll_interval: int = 2):
             if any(QUEUE_DIR.glob("*.json")):
                 print("\n🚀 Jobs detected. Spinning up PetaKit Matlab Server...")
 
-                env1 = env.copy()
-                env1["PETAKIT_SERVER_ID"] = "1"
-                env1["PETAKIT_GPU_ID"] = "1"
-                env1["CUDA_VISIBLE_DEVICES"] = "0"
-                env1["PETAKIT_CPUS"] = "10"  # Limit workers to prevent GPU OOM
-                
-                env2 = env.copy()
-                env2["PETAKIT_SERVER_ID"] = "2"
-                env2["PETAKIT_GPU_ID"] = "1"  # Both use GPU index 1 because CUDA restricts visibility to 1 device
-                env2["CUDA_VISIBLE_DEVICES"] = "1"
-                env2["PETAKIT_CPUS"] = "10"  # Limit workers to prevent GPU OOM
-
-                # Use bash to load the matlab module so licensing works correctly
-                cmd_str = f"module load matlab/R2024b && matlab -nodisplay -sd {OPYM_DIR} -batch run_petakit_server"
-                
-                cmd = ["bash", "-c", cmd_str]
-
                 print("➡️  Launching Server 1 on GPU 1...")
-                p1 = subprocess.Popen(cmd, env=env1)
-                
+                servers = [_launch_server(cmd, env1, "S1")]
+
                 print("➡️  Launching Server 2 on GPU 2...")
-                p2 = subprocess.Popen(cmd, env=env2)
+                servers.append(_launch_server(cmd, env2, "S2"))
 
                 # This will block until both Matlab scripts complete
                 # their queues AND their timeouts
-                p1.wait()
-                p2.wait()
+                for i, (proc, reader) in enumerate(servers, start=1):
+                    rc = proc.wait()
+                    reader.join()
+                    if rc:
+                        print(f"⚠️  Server {i} exited with code {rc}")
 
                 print(
                     f"🛑 Matlab server spun down after {idle_timeout_sec}s "
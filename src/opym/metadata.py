@@ -5,15 +5,26 @@ Handles Micro-Manager metadata parsing and processing log generation.
 
 from __future__ import annotations
 
-import json
 import sys
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, overload
 
+from ._jsonio import dumps, loads
 from .utils import DerivedPaths, OutputFormat
 
 
+@lru_cache(maxsize=8)
+def _load_settings_cached(path_str: str, mtime: float) -> dict[str, Any]:
+    """
+    Parses a settings JSON file, keyed on (path, mtime) so unchanged files
+    are only read once. The returned dict is shared; callers must not mutate it.
+    """
+    # Decode as 'latin-1' to handle special characters
+    return loads(Path(path_str).read_bytes().decode("latin-1"))
+
+
 def _get_spim_settings(metadata_file: Path) -> dict[str, Any]:
     """
     Helper to parse the 'AcqSettings.txt' file, which is assumed
@@ -28,9 +39,9 @@ def _get_spim_settings(metadata_file: Path) -> dict[str, Any]:
         return {}
 
     try:
-        # Open with 'latin-1' encoding to handle special characters
-        with acq_settings_file.open("r", encoding="latin-1") as f:
-            return json.load(f)
+        return _load_settings_cached(
+            str(acq_settings_file), acq_settings_file.stat().st_mtime
+        )
     except Exception as e:
         print(
             f"Warning: Could not parse AcqSettings.txt: {e}",
@@ -89,8 +100,7 @@ def parse_timestamps(metadata_file: Path, num_timepoints: int) -> list[float]:
 
     try:
         # Open the metadata file for FrameKey data
-        with metadata_file.open("r", encoding="latin-1") as f:
-            metadata = json.load(f)
+        metadata = loads(metadata_file.read_bytes().decode("latin-1"))
 
         for t in range(num_timepoints):
             # Key is "FrameKey-T-Z-C". We want the start of each
@@ -183,8 +193,7 @@ def create_processing_log(
     }
 
     try:
-        with paths.output_log.open("w") as f:
-            json.dump(log_data, f, indent=4)
+        paths.output_log.write_bytes(dumps(log_data, indent=True))
         print(f"✅ Successfully wrote processing log to {paths.output_log.name}")
     except Exception as e:
         print(f"Error writing log file: {e}", file=sys.stderr)
@@ -5,26 +5,144 @@ Utilities for interacting with the PetaKit job queue system.
 
 from __future__ import annotations
 
-import json
+import asyncio
+import ctypes
+import itertools
+import os
 import re
+import select
+import string
+import sys
 import threading
 import time
+import weakref
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-import ipywidgets as widgets
-
+from ._jsonio import dump_atomic
 from .roi_utils import _roi_to_tuple, _tuple_to_cli_string
 
+if TYPE_CHECKING:
+    # Only needed for annotations; keeps ticket submission usable without Jupyter
+    import ipywidgets as widgets
+
 # Constants
 BASE_DIR = Path("/dev/shm/petakit_jobs")
 QUEUE_DIR = BASE_DIR / "queue"
 DONE_DIR = BASE_DIR / "completed"
 FAIL_DIR = BASE_DIR / "failed"
 
+# inotify event bits (<sys/inotify.h>) for a ticket landing in a directory
+_IN_ATTRIB = 0x004
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+
+# Growth factor for the wait_for_job poll interval while nothing happens
+_POLL_BACKOFF = 1.5
+
+# Characters not allowed in a ticket file name
+_UNSAFE_NAME_RE = re.compile(r"[^\w\-_\.]")
+# The same rule as a byte table, for ASCII names
+_SAFE_ASCII = (string.ascii_letters + string.digits + "_-.").encode()
+_SANITIZE_TABLE = bytes(c if c in _SAFE_ASCII else ord("_") for c in range(256))
+
+# Per-process ticket sequence; with the pid it keeps names unique when
+# several tickets are submitted within the same millisecond.
+_ticket_counter = itertools.count()
+
+_ready_dirs: set[Path] = set()
+_dirs_lock = threading.Lock()
+
+
+def _ensure_directories(queue_dir: Path = QUEUE_DIR):
+    """
+    Ensures the job queue directory exists (checked once per directory per
+    process; _write_payload re-creates it if it is removed afterwards).
+    """
+    if queue_dir in _ready_dirs:
+        return
+    with _dirs_lock:
+        # A stat is cheaper than a no-op mkdir on shared filesystems
+        if not queue_dir.is_dir():
+            queue_dir.mkdir(parents=True, exist_ok=True)
+        _ready_dirs.add(queue_dir)
+
+
+def tif_base_name(path: Path) -> str:
+    """
+    Returns a file name without its '.ome.tif' / '.tif' extension.
+    This matches the output folder naming in run_bigtiff_cropper.m.
+    """
+    name = path.name
+    lower = name.lower()
+    if lower.endswith(".ome.tif"):
+        return name[:-8]
+    if lower.endswith(".tif"):
+        return name[:-4]
+    return name
+
+
+def _sanitize_name(name: str) -> str:
+    """Replaces characters not allowed in a ticket file name with '_'."""
+    if name.isascii():  # Common case: one C-level byte translation
+        return name.encode("ascii").translate(_SANITIZE_TABLE).decode("ascii")
+    return _UNSAFE_NAME_RE.sub("_", name)
+
+
+def _default_iterations(iterations: int | None, rl_method: str) -> int:
+    """Returns the RL iteration count, defaulting to 2 for OMW and 25 otherwise."""
+    if iterations is not None:
+        return iterations
+    return 2 if rl_method == "omw" else 25
+
+
+def _job_path(path: str | Path) -> Path:
+    """
+    Makes a path absolute for a job ticket without touching the filesystem.
+
+    Path.resolve() stats every component, which is slow on GPFS/Lustre mounts.
+    The Matlab server runs on the same host and follows symlinks itself, so
+    only an absolute path is needed here, not a canonical one. os.path.abspath
+    (unlike Path.absolute) also collapses '..', so `.name` is never '..'.
+    """
+    return Path(os.path.abspath(path))
+
+
+def _crop_params(
+    top_roi: tuple[slice, slice] | None,
+    bottom_roi: tuple[slice, slice] | None,
+    channels: list[int] | None,
+    timepoints: list[int] | None,
+    output_format: str,
+    rotate: bool,
+    z_step_um: float | None,
+    xy_pixel_size: float | None,
+    exposure_mode: str,
+    active_channels: list[str] | None,
+) -> dict:
+    """Builds the 'parameters' block of a crop ticket."""
+    # ROI formatting for CLI
+    rois = {}
+    if top_roi:
+        rois["top"] = _tuple_to_cli_string(_roi_to_tuple(top_roi))
+    if bottom_roi:
+        rois["bottom"] = _tuple_to_cli_string(_roi_to_tuple(bottom_roi))
+
+    params = {
+        "rois": rois,
+        "channels": channels,
+        "timepoints": timepoints,
+        "rotate": rotate,
+        "format": output_format,
+        "exposure_mode": exposure_mode,
+        "active_channels": active_channels,
+    }
 
-def _ensure_directories():
-    """Ensures the job queue directory exists."""
-    QUEUE_DIR.mkdir(parents=True, exist_ok=True)
+    if z_step_um is not None:
+        params["z_step_um"] = z_step_um
+    if xy_pixel_size is not None:
+        params["xy_pixel_size"] = xy_pixel_size
+    return params
 
 
 def submit_remote_crop_job(
@@ -41,56 +159,41 @@ def submit_remote_crop_job(
     exposure_mode: str = "Single Exposure (All Lasers)",
     active_channels: list[str] | None = None,
     queue_dir: Path = QUEUE_DIR,
+    verbose: bool = True,
 ) -> Path:
     """
     Creates a JSON job ticket for Cropping.
     Automatically handles BigTiff naming conventions.
+    Pass verbose=False to skip the confirmation message (e.g. in batch loops).
     """
-    _ensure_directories()
-    base_file = Path(base_file).resolve()
+    _ensure_directories(queue_dir)
+    base_file = _job_path(base_file)
 
-    # ROI formatting for CLI
-    rois = {}
-    if top_roi:
-        rois["top"] = _tuple_to_cli_string(_roi_to_tuple(top_roi))
-    if bottom_roi:
-        rois["bottom"] = _tuple_to_cli_string(_roi_to_tuple(bottom_roi))
-
-    # Calculate clean base name (removing .ome.tif or .tif)
-    # This matches the logic in run_bigtiff_cropper.m
-    base_name = base_file.name
-    if base_name.lower().endswith(".ome.tif"):
-        base_name = base_name[:-8]
-    elif base_name.lower().endswith(".tif"):
-        base_name = base_name[:-4]
+    base_name = tif_base_name(base_file)
 
     if test_mode:
         base_name = f"{base_name}_test"
 
-    payload = {
-        "jobType": "crop",
-        "dataDir": str(base_file),
-        "baseName": base_name,
-        "parameters": {
-            "rois": rois,
-            "channels": channels,
-            "timepoints": timepoints,
-            "rotate": rotate,
-            "format": output_format,
-            "exposure_mode": exposure_mode,
-            "active_channels": active_channels,
-        },
-    }
-
-    if z_step_um is not None:
-        payload["parameters"]["z_step_um"] = z_step_um
-    if xy_pixel_size is not None:
-        payload["parameters"]["xy_pixel_size"] = xy_pixel_size
+    params = _crop_params(
+        top_roi,
+        bottom_roi,
+        channels,
+        timepoints,
+        output_format,
+        rotate,
+        z_step_um,
+        xy_pixel_size,
+        exposure_mode,
+        active_channels,
+    )
 
-    job_file = _write_ticket(payload, base_name, "CROP", queue_dir)
+    job_file = _write_ticket("crop", base_file, base_name, params, queue_dir)
 
-    print(f"✅ Job Ticket Created: {job_file.name}")
-    print(f"   Target Output Dir: {base_name}")
+    if verbose:
+        print(
+            f"✅ Job Ticket Created: {job_file.name}\n"
+            f"   Target Output Dir: {base_name}"
+        )
 
     return job_file
 
@@ -116,6 +219,9 @@ def submit_remote_deskew_job(
     reverse: bool = True,
     gpu_decon: bool = False,
     crop_was_rotated: bool = False,
+    rl_method: str = "simple",
+    save_zarr: bool = False,
+    block_size: tuple[int, int, int] | None = None,
 ) -> Path:
     """
     Creates a JSON job ticket for Deskew/Rotate and optional Deconvolution.
@@ -125,10 +231,10 @@ def submit_remote_deskew_job(
     input_axis_order : str, default 'yxz'
         Axis order of input data. Must match PetaKit5D conventions.
         'yxz' = MATLAB cropper output (rows=Y, cols=X, planes=Z).
-        Automatically set to 'xyz' if crop_was_rotated=True, because
-        rot90 in MATLAB transposes dim1/dim2 (Y↔X).
+        Currently ignored: the ticket always uses 'yxz' so the X axis is
+        sheared (see _deskew_params).
     output_axis_order : str, default 'yxz'
-        Desired axis order of output data.
+        Desired axis order of output data. Currently ignored, as above.
     objective_scan : bool, default False
         True if the objective moves during scanning. For standard galvo-
         scanned OPM this should be False.
@@ -141,41 +247,91 @@ def submit_remote_deskew_job(
         Use GPU for deconvolution (requires CUDA-capable GPU on the
         processing node).
     crop_was_rotated : bool, default False
-        If True, the crop step applied rot90 to match LLSM visual
-        orientation. This swaps Y↔X in the output TIFFs, so
-        input_axis_order is auto-corrected to 'xyz'.
+        Whether the crop step applied rot90. Accepted for compatibility;
+        it does not change the (fixed) axis orders.
+    save_zarr : bool, default False
+        Write DS/DSR results as chunked Zarr stores instead of 3D TIFF
+        stacks, so downstream readers can fetch sub-regions without
+        decoding whole planes.
+    block_size : tuple of int, optional
+        Zarr chunk shape (PetaKit5D 'BlockSize', in output axis order).
+        Only used with save_zarr; defaults to the PetaKit5D default.
     """
-    _ensure_directories()
-    input_target = Path(input_target).resolve()
-
-    # PetaKit5D's default 'yxz' shears the 2nd dimension (X).
-    # Since the galvo sweeps in the depth-Z plane, the coverslip (Y) is the invariant axis.
-    # Therefore, we MUST shear the X axis. So 'yxz' is mathematically perfect.
-    input_axis_order = "yxz"
-    output_axis_order = "yxz"
+    _ensure_directories(queue_dir)
+    input_target = _job_path(input_target)
 
     # --- PATH REDIRECTION LOGIC ---
+    # Every branch that redirects has just confirmed its target exists,
+    # so only a non-file input needs the existence check.
     if input_target.is_file():
-        folder_name = input_target.name
-        if folder_name.lower().endswith(".ome.tif"):
-            folder_name = folder_name[:-8]
-        elif folder_name.lower().endswith(".tif"):
-            folder_name = folder_name[:-4]
-
-        potential_dir = input_target.parent / folder_name
+        potential_dir = input_target.parent / tif_base_name(input_target)
         if potential_dir.exists():
             input_target = potential_dir
         else:
             legacy_dir = input_target.parent / "processed_tiff_series_split"
             if legacy_dir.exists():
                 input_target = legacy_dir
-
-    if not input_target.exists():
+    elif not input_target.exists():
         raise FileNotFoundError(f"Input directory not found: {input_target}")
 
-    base_name = input_target.name
+    params = _deskew_params(
+        z_step_um=z_step_um,
+        xy_pixel_size=xy_pixel_size,
+        sheet_angle_deg=sheet_angle_deg,
+        deskew=deskew,
+        rotate=rotate,
+        interp_method=interp_method,
+        ds_dir_name=ds_dir_name,
+        dsr_dir_name=dsr_dir_name,
+        psf_path=psf_path,
+        n_iters=n_iters,
+        channel_patterns=channel_patterns,
+        objective_scan=objective_scan,
+        z_stage_scan=z_stage_scan,
+        reverse=reverse,
+        gpu_decon=gpu_decon,
+        rl_method=rl_method,
+        save_zarr=save_zarr,
+        block_size=block_size,
+    )
+
+    return _write_ticket(
+        "deskew", input_target, input_target.name, params, queue_dir, match_prefix=True
+    )
+
+
+def _deskew_params(
+    z_step_um: float,
+    xy_pixel_size: float = 0.136,
+    sheet_angle_deg: float = 60.0,
+    deskew: bool = True,
+    rotate: bool = True,
+    interp_method: str = "cubic",
+    ds_dir_name: str = "DS",
+    dsr_dir_name: str = "DSR",
+    psf_path: str | Path | None = None,
+    n_iters: int | None = None,
+    channel_patterns: list[str] | None = None,
+    objective_scan: bool = False,
+    z_stage_scan: bool = False,
+    reverse: bool = True,
+    gpu_decon: bool = False,
+    rl_method: str = "simple",
+    save_zarr: bool = False,
+    block_size: tuple[int, int, int] | None = None,
+) -> dict:
+    """
+    Builds the 'parameters' block of a deskew ticket, for both the standalone
+    and the fused crop+deskew submitters. Defaults match
+    submit_remote_deskew_job.
+    """
+    # PetaKit5D's default 'yxz' shears the 2nd dimension (X).
+    # Since the galvo sweeps in the depth-Z plane, the coverslip (Y) is the
+    # invariant axis. Therefore, we MUST shear the X axis. So 'yxz' is
+    # mathematically perfect, whatever axis order a caller asked for.
+    input_axis_order = "yxz"
+    output_axis_order = "yxz"
 
-    # Build parameters dictionary
     params = {
         "ds_dir_name": ds_dir_name,
         "dsr_dir_name": dsr_dir_name,
@@ -196,18 +352,117 @@ def submit_remote_deskew_job(
     if psf_path:
         params["run_decon"] = True
         params["psf_path"] = str(psf_path)
-        params["decon_iter"] = n_iters if n_iters is not None else (2 if rl_method == "omw" else 25)
+        params["decon_iter"] = _default_iterations(n_iters, rl_method)
         params["rl_method"] = rl_method
         params["gpu_decon"] = gpu_decon
 
-    payload = {
-        "jobType": "deskew",
-        "dataDir": str(input_target),
-        "baseName": f"{base_name}*",
-        "parameters": params,
-    }
+    if save_zarr:
+        params["save_zarr"] = True
+        if block_size is not None:
+            params["block_size"] = list(block_size)
+    return params
 
-    return _write_ticket(payload, base_name, "DESKEW", queue_dir)
+
+def submit_remote_crop_deskew_job(
+    base_file: Path,
+    top_roi: tuple[slice, slice] | None,
+    bottom_roi: tuple[slice, slice] | None,
+    z_step_um: float,
+    channels: list[int] | None = None,
+    timepoints: list[int] | None = None,
+    output_format: str = "tiff-series",
+    rotate: bool = True,
+    xy_pixel_size: float = 0.136,
+    exposure_mode: str = "Single Exposure (All Lasers)",
+    active_channels: list[str] | None = None,
+    sheet_angle_deg: float = 60.0,
+    deskew: bool = True,
+    deskew_rotate: bool = True,
+    interp_method: str = "cubic",
+    ds_dir_name: str = "DS",
+    dsr_dir_name: str = "DSR",
+    psf_path: str | Path | None = None,
+    n_iters: int | None = None,
+    channel_patterns: list[str] | None = None,
+    objective_scan: bool = False,
+    z_stage_scan: bool = False,
+    reverse: bool = True,
+    gpu_decon: bool = False,
+    rl_method: str = "simple",
+    save_zarr: bool = False,
+    block_size: tuple[int, int, int] | None = None,
+    queue_dir: Path = QUEUE_DIR,
+    verbose: bool = True,
+) -> Path:
+    """
+    Creates a single job ticket that crops a BigTiff and then deskews the
+    cropped output, instead of one crop and one deskew ticket.
+
+    The server runs both stages back to back in the same worker, so the
+    deskew can never start before its input exists. The crop arguments are
+    those of submit_remote_crop_job (`rotate` is the crop's 90-degree
+    rotation); the rest configure the deskew stage exactly as
+    submit_remote_deskew_job does, with `deskew_rotate` as its `rotate`.
+    """
+    _ensure_directories(queue_dir)
+    base_file = _job_path(base_file)
+    base_name = tif_base_name(base_file)
+
+    crop_params = _crop_params(
+        top_roi,
+        bottom_roi,
+        channels,
+        timepoints,
+        output_format,
+        rotate,
+        z_step_um,
+        xy_pixel_size,
+        exposure_mode,
+        active_channels,
+    )
+    deskew_params = _deskew_params(
+        z_step_um=z_step_um,
+        xy_pixel_size=xy_pixel_size,
+        sheet_angle_deg=sheet_angle_deg,
+        deskew=deskew,
+        rotate=deskew_rotate,
+        interp_method=interp_method,
+        ds_dir_name=ds_dir_name,
+        dsr_dir_name=dsr_dir_name,
+        psf_path=psf_path,
+        n_iters=n_iters,
+        channel_patterns=channel_patterns,
+        objective_scan=objective_scan,
+        z_stage_scan=z_stage_scan,
+        reverse=reverse,
+        gpu_decon=gpu_decon,
+        rl_method=rl_method,
+        save_zarr=save_zarr,
+        block_size=block_size,
+    )
+
+    # The cropper writes into '<base_name>/' next to the BigTiff
+    stages = [
+        _ticket_payload("crop", base_file, base_name, crop_params),
+        _ticket_payload(
+            "deskew",
+            base_file.parent / base_name,
+            base_name,
+            deskew_params,
+            match_prefix=True,
+        ),
+    ]
+    payload = _ticket_payload("crop_deskew", base_file, base_name, {})
+    payload["stages"] = stages
+    job_file = _write_payload(payload, "crop_deskew", base_name, queue_dir)
+
+    if verbose:
+        print(
+            f"✅ Job Ticket Created: {job_file.name}\n"
+            f"   Target Output Dir: {base_name}"
+        )
+
+    return job_file
 
 
 def submit_remote_decon_job(
@@ -224,8 +479,8 @@ def submit_remote_decon_job(
     """
     Creates a JSON job ticket for standalone Deconvolution.
     """
-    _ensure_directories()
-    input_target = Path(input_target).resolve()
+    _ensure_directories(queue_dir)
+    input_target = _job_path(input_target)
 
     if not input_target.exists():
         raise FileNotFoundError(f"Input directory not found: {input_target}")
@@ -234,7 +489,7 @@ def submit_remote_decon_job(
 
     params = {
         "result_dir_name": result_dir_name,
-        "iterations": iterations if iterations is not None else (2 if rl_method == "omw" else 25),
+        "iterations": _default_iterations(iterations, rl_method),
         "gpu_job": gpu_job,
         "skewed": skewed,
         "rl_method": rl_method,
@@ -244,14 +499,9 @@ def submit_remote_decon_job(
     if channel_patterns:
         params["channel_patterns"] = channel_patterns
 
-    payload = {
-        "jobType": "decon",
-        "dataDir": str(input_target),
-        "baseName": f"{base_name}*",
-        "parameters": params,
-    }
-
-    return _write_ticket(payload, base_name, "DECON", queue_dir)
+    return _write_ticket(
+        "decon", input_target, base_name, params, queue_dir, match_prefix=True
+    )
 
 
 def _read_psf_dz(psf_path: str | Path) -> float | None:
@@ -306,8 +556,8 @@ def submit_pipeline_job(
         Raises ValueError if it cannot be determined either way -- a silent
         wrong default here previously caused a real decon/DSR regression.
     """
-    _ensure_directories()
-    output_file = Path(output_file).resolve()
+    _ensure_directories(queue_dir)
+    output_file = _job_path(output_file)
     data_dir = output_file.parent
     base_name = output_file.name
 
@@ -334,7 +584,7 @@ def submit_pipeline_job(
         "z_step_um": z_step_um,
         "sheet_angle_deg": sheet_angle_deg,
         "interp_method": interp_method,
-        "iterations": iterations if iterations is not None else (2 if rl_method == "omw" else 25),
+        "iterations": _default_iterations(iterations, rl_method),
         "rl_method": rl_method,
         "save_zarr": save_zarr,
         "debug": debug,
@@ -348,14 +598,7 @@ def submit_pipeline_job(
     if channel_patterns:
         params["channel_patterns"] = channel_patterns
 
-    payload = {
-        "jobType": "pipeline",
-        "dataDir": str(data_dir),
-        "baseName": base_name,
-        "parameters": params,
-    }
-
-    return _write_ticket(payload, base_name, "PIPELINE", queue_dir)
+    return _write_ticket("pipeline", data_dir, base_name, params, queue_dir)
 
 
 # --- BACKWARD COMPATIBILITY ALIASES ---
@@ -378,9 +621,71 @@ def run_petakit_processing(
     )
 
 
-def wait_for_job(job_path: Path, poll_interval: int = 2) -> bool:
+def _inotify_init() -> int | None:
+    """
+    Returns a new non-blocking inotify fd, or None if inotify is unavailable
+    (non-Linux, or the per-user instance limit is reached).
+    """
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        fd = ctypes.CDLL(None, use_errno=True).inotify_init1(
+            os.O_NONBLOCK | os.O_CLOEXEC
+        )
+    except (OSError, AttributeError):
+        return None
+    return fd if fd >= 0 else None
+
+
+def _add_watch(fd: int, directory: Path) -> bool:
+    """Watches directory for new entries on fd; False if it cannot be watched."""
+    mask = _IN_CREATE | _IN_MOVED_TO | _IN_ATTRIB
+    libc = ctypes.CDLL(None, use_errno=True)
+    return libc.inotify_add_watch(fd, os.fsencode(directory), mask) >= 0
+
+
+def _watch_dirs(dirs: list[Path]) -> int | None:
+    """
+    Returns a non-blocking inotify fd watching dirs for new entries, or None
+    if inotify is unavailable (non-Linux, missing directory, watch limit).
+    """
+    fd = _inotify_init()
+    if fd is None:
+        return None
+    for directory in dirs:
+        if not _add_watch(fd, directory):
+            os.close(fd)
+            return None
+    return fd
+
+
+def _wait_for_entry(watch_fd: int | None, timeout: float) -> bool:
+    """
+    Sleeps up to `timeout` seconds, returning early (and True) when a
+    directory watched by `watch_fd` gains an entry. Falls back to a plain
+    sleep without inotify.
+    """
+    if watch_fd is None:
+        time.sleep(timeout)
+        return False
+    if not select.select([watch_fd], [], [], timeout)[0]:
+        return False
+    try:
+        os.read(watch_fd, 65536)  # Drain; callers re-check their paths
+    except BlockingIOError:
+        pass
+    return True
+
+
+def wait_for_job(
+    job_path: Path, poll_interval: float = 0.25, max_interval: float = 30.0
+) -> bool:
     """
     Blocks and monitors the job ticket (Blocking version).
+    On Linux this wakes as soon as the ticket is moved to completed/failed.
+    Otherwise it polls, starting every `poll_interval` seconds and backing off
+    to `max_interval` on long jobs; any new ticket in completed/failed resets
+    the interval.
     """
     queue_dir = job_path.parent
     base_dir = queue_dir.parent
@@ -388,61 +693,257 @@ def wait_for_job(job_path: Path, poll_interval: int = 2) -> bool:
     failed_path = base_dir / "failed" / job_path.name
 
     print(f"⏳ Monitoring Job: {job_path.name}")
-    start_time = time.time()
+    # Monotonic, so durations stay correct across suspends and clock steps
+    start_time = time.monotonic()
 
+    # Watch before the first probe so a ticket landing in between still wakes us
+    watch_fd = _watch_dirs([completed_path.parent, failed_path.parent])
+    interval = poll_interval
     try:
         while True:
             if completed_path.exists():
-                print(f"✅ Job Finished! ({time.time() - start_time:.1f}s)")
+                print(f"✅ Job Finished! ({time.monotonic() - start_time:.1f}s)")
                 return True
             if failed_path.exists():
                 print("❌ Job Failed.")
                 return False
 
-            time.sleep(poll_interval)
+            # The interval still bounds the wait in case an event is missed
+            if _wait_for_entry(watch_fd, interval):
+                interval = poll_interval
+            else:
+                interval = min(interval * _POLL_BACKOFF, max_interval)
     except KeyboardInterrupt:
         return False
+    finally:
+        if watch_fd is not None:
+            os.close(watch_fd)
 
 
-def _write_ticket(payload: dict, base_name: str, prefix: str, queue_dir: Path) -> Path:
-    """Helper to write the JSON file."""
-    timestamp = int(time.time() * 1000)
-    # Sanitize name
-    safe_name = re.sub(r"[^\w\-_\.]", "_", base_name)
-    job_file = queue_dir / f"{prefix}_{safe_name}_{timestamp}.json"
-
-    with open(job_file, "w") as f:
-        json.dump(payload, f, indent=4)
-    return job_file
-
+class _AsyncDirWatcher:
+    """
+    One inotify fd per event loop, shared by every wait_for_job_async call on
+    that loop, so awaiting many jobs does not use one inotify instance each
+    (the default per-user limit is 128). Any new entry in a watched directory
+    wakes all waiters, which then re-check their own ticket paths.
+    The watcher closes itself when its last waiter leaves.
+    """
 
-def monitor_job_background(job_path: Path, status_label: widgets.Label):
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+        self._fd = _inotify_init()
+        self._dirs: set[Path] = set()
+        self._waiters: set[asyncio.Event] = set()
+        if self._fd is not None:
+            loop.add_reader(self._fd, self._on_event)
+
+    @classmethod
+    def for_loop(cls, loop: asyncio.AbstractEventLoop) -> _AsyncDirWatcher:
+        watcher = _async_watchers.get(loop)
+        if watcher is None:
+            watcher = _async_watchers[loop] = cls(loop)
+        return watcher
+
+    def subscribe(self, dirs: list[Path], woke: asyncio.Event):
+        """Sets `woke` whenever one of dirs gains an entry (best effort)."""
+        self._waiters.add(woke)
+        if self._fd is None:
+            return  # The waiter's poll interval still bounds its wait
+        for directory in dirs:
+            if directory not in self._dirs and _add_watch(self._fd, directory):
+                self._dirs.add(directory)
+
+    def unsubscribe(self, woke: asyncio.Event):
+        self._waiters.discard(woke)
+        if not self._waiters:
+            _async_watchers.pop(self._loop, None)
+            if self._fd is not None:
+                self._loop.remove_reader(self._fd)
+                os.close(self._fd)
+                self._fd = None
+
+    def _on_event(self):
+        try:
+            os.read(self._fd, 65536)  # Drain; waiters re-check their paths
+        except BlockingIOError:
+            pass
+        for woke in self._waiters:
+            woke.set()
+
+
+_async_watchers: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, _AsyncDirWatcher
+] = weakref.WeakKeyDictionary()
+
+
+async def wait_for_job_async(
+    job_path: Path, poll_interval: float = 0.25, max_interval: float = 30.0
+) -> bool:
     """
-    Spawns a background thread to monitor the job (Async version).
+    Awaitable version of wait_for_job, so many jobs can be awaited from one
+    event loop without a thread each, e.g. in a notebook:
+    ``await asyncio.gather(*(wait_for_job_async(j) for j in jobs))``.
     """
+    queue_dir = job_path.parent
+    base_dir = queue_dir.parent
+    completed_path = base_dir / "completed" / job_path.name
+    failed_path = base_dir / "failed" / job_path.name
 
-    def _poll():
-        queue_dir = job_path.parent
-        base_dir = queue_dir.parent
-        completed_path = base_dir / "completed" / job_path.name
-        failed_path = base_dir / "failed" / job_path.name
+    start_time = time.monotonic()
+    woke = asyncio.Event()
 
-        start_time = time.time()
+    watcher = _AsyncDirWatcher.for_loop(asyncio.get_running_loop())
+    watcher.subscribe([completed_path.parent, failed_path.parent], woke)
 
+    interval = poll_interval
+    try:
         while True:
-            elapsed = int(time.time() - start_time)
+            woke.clear()  # Before probing, so a landing ticket is never missed
             if completed_path.exists():
-                status_label.value = f"✅ Job Finished! ({elapsed}s)"
-                break
+                elapsed = time.monotonic() - start_time
+                print(f"✅ Job Finished: {job_path.name} ({elapsed:.1f}s)")
+                return True
             if failed_path.exists():
-                status_label.value = f"❌ Job Failed. ({elapsed}s)"
-                break
+                print(f"❌ Job Failed: {job_path.name}")
+                return False
+            try:
+                await asyncio.wait_for(woke.wait(), interval)
+                interval = poll_interval
+            except asyncio.TimeoutError:
+                interval = min(interval * _POLL_BACKOFF, max_interval)
+    finally:
+        watcher.unsubscribe(woke)
+
+
+def _ticket_payload(
+    job_type: str,
+    data_dir: Path,
+    base_name: str,
+    params: dict,
+    match_prefix: bool = False,
+) -> dict:
+    """
+    Builds a job payload. With match_prefix, the server matches every file
+    starting with base_name ('<base_name>*').
+    """
+    return {
+        "jobType": job_type,
+        "dataDir": str(data_dir),
+        "baseName": f"{base_name}*" if match_prefix else base_name,
+        "parameters": params,
+    }
 
-            status_label.value = f"⏳ Running... (Elapsed: {elapsed}s)"
-            time.sleep(2)
 
-    t = threading.Thread(target=_poll, daemon=True)
-    t.start()
+def _write_ticket(
+    job_type: str,
+    data_dir: Path,
+    base_name: str,
+    params: dict,
+    queue_dir: Path,
+    match_prefix: bool = False,
+) -> Path:
+    """Builds the job payload and writes it to the queue (see _write_payload)."""
+    payload = _ticket_payload(job_type, data_dir, base_name, params, match_prefix)
+    return _write_payload(payload, job_type, base_name, queue_dir)
+
+
+def _write_payload(
+    payload: dict, job_type: str, base_name: str, queue_dir: Path
+) -> Path:
+    """
+    Writes a job payload to the queue as
+    '<JOBTYPE>_<base_name>_<ms>_<seq>_<pid>.json'.
+    """
+    prefix = job_type.upper()
+    timestamp = time.time_ns() // 1_000_000  # Integer ms, no float rounding
+    # Sanitize name
+    safe_name = _sanitize_name(base_name)
+    seq = next(_ticket_counter)  # Atomic under the GIL
+    job_file = (
+        queue_dir / f"{prefix}_{safe_name}_{timestamp}_{seq:06d}_{os.getpid()}.json"
+    )
+
+    # Serialized in one buffer (orjson when installed) and written to a hidden
+    # temp file, then renamed: the server only lists visible '*.json', so it
+    # can never pick up a half-written ticket.
+    try:
+        dump_atomic(payload, job_file, indent=True)
+    except FileNotFoundError:
+        # The queue was removed (e.g. /dev/shm cleared) since it was checked
+        queue_dir.mkdir(parents=True, exist_ok=True)
+        dump_atomic(payload, job_file, indent=True)
+    return job_file
+
+
+class _JobMonitor:
+    """
+    A single background thread that updates the status labels of every job
+    passed to monitor_job_background, instead of one polling thread per job.
+    The thread starts on the first registration and exits once all jobs end.
+    """
+
+    def __init__(self):
+        self._jobs: dict[Path, tuple[widgets.Label, float]] = {}
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def register(self, job_path: Path, status_label: widgets.Label):
+        with self._lock:
+            self._jobs[job_path] = (status_label, time.monotonic())
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        watch_fd: int | None = None
+        watched: set[Path] = set()
+        try:
+            while True:
+                with self._lock:
+                    if not self._jobs:
+                        self._thread = None
+                        return
+                    jobs = list(self._jobs.items())
+
+                # Re-arm the watch only when a job from a new queue appears
+                dirs = set()
+                for job_path, _ in jobs:
+                    base_dir = job_path.parent.parent
+                    dirs.update((base_dir / "completed", base_dir / "failed"))
+                if dirs != watched:
+                    if watch_fd is not None:
+                        os.close(watch_fd)
+                    watch_fd = _watch_dirs(sorted(dirs))
+                    watched = dirs
+
+                for job_path, (status_label, start_time) in jobs:
+                    base_dir = job_path.parent.parent
+                    elapsed = int(time.monotonic() - start_time)
+                    if (base_dir / "completed" / job_path.name).exists():
+                        status_label.value = f"✅ Job Finished! ({elapsed}s)"
+                    elif (base_dir / "failed" / job_path.name).exists():
+                        status_label.value = f"❌ Job Failed. ({elapsed}s)"
+                    else:
+                        status_label.value = f"⏳ Running... (Elapsed: {elapsed}s)"
+                        continue
+                    with self._lock:
+                        self._jobs.pop(job_path, None)
+
+                # Wakes early when a ticket lands; otherwise ticks the labels
+                _wait_for_entry(watch_fd, 2)
+        finally:
+            if watch_fd is not None:
+                os.close(watch_fd)
+
+
+_job_monitor = _JobMonitor()
+
+
+def monitor_job_background(job_path: Path, status_label: widgets.Label):
+    """
+    Monitors the job on the shared background thread (Async version).
+    """
+    _job_monitor.register(job_path, status_label)
 
 
 def submit_crop_and_save_sidecar(
@@ -472,16 +973,9 @@ def submit_crop_and_save_sidecar(
     )
 
     # 2. Determine and create output directory
-    name = file_path.name
-    if name.endswith(".ome.tif"):
-        clean_name = name[:-8]
-    elif name.endswith(".tif"):
-        clean_name = name[:-4]
-    else:
-        clean_name = file_path.stem
-
-    output_dir = file_path.parent / clean_name
-    output_dir.mkdir(parents=True, exist_ok=True)
+    output_dir = file_path.parent / tif_base_name(file_path)
+    if not output_dir.is_dir():
+        output_dir.mkdir(parents=True, exist_ok=True)
 
     # 3. Create JSON Sidecar (Safely handling None ROIs)
     sidecar = output_dir / "petakit_settings.json"
@@ -500,7 +994,9 @@ def submit_crop_and_save_sidecar(
         "format": output_format,
     }
 
-    with open(sidecar, "w") as f:
-        json.dump(settings, f, indent=4)
+    # Batch runs reuse this file as their template, so never leave it half-written.
+    # dump_atomic writes ASCII-only JSON (non-ASCII names escaped), so readers
+    # get the same text whatever their locale encoding.
+    dump_atomic(settings, sidecar, indent=True)
 
     return job_path, output_dir
@@ -7,12 +7,17 @@ from __future__ import annotations
 
 import json
 import sys
+import zlib
 from pathlib import Path
 from typing import overload
 
 import numpy as np
-from skimage.filters import window
-from skimage.registration import phase_cross_correlation
+
+from ._jsonio import dumps, loads, write_atomic
+
+# Last reference spectrum computed by align_rois, as (key, FFT); see
+# _reference_spectrum. Only the spectrum is held, never the MIP itself.
+_ref_spectrum_cache: tuple[tuple, np.ndarray] | None = None
 
 
 @overload
@@ -29,11 +34,14 @@ def _roi_to_tuple(
     """Converts (slice(y1, y2), slice(x1, x2)) to (y1, y2, x1, x2) or None."""
     if roi is None:
         return None
-    y_start = roi[0].start if roi[0].start is not None else 0
-    y_stop = roi[0].stop if roi[0].stop is not None else -1
-    x_start = roi[1].start if roi[1].start is not None else 0
-    x_stop = roi[1].stop if roi[1].stop is not None else -1
-    return (y_start, y_stop, x_start, x_stop)
+    y, x = roi  # Read each slice's attributes once
+    y_start, y_stop, x_start, x_stop = y.start, y.stop, x.start, x.stop
+    return (
+        y_start if y_start is not None else 0,
+        y_stop if y_stop is not None else -1,
+        x_start if x_start is not None else 0,
+        x_stop if x_stop is not None else -1,
+    )
 
 
 def _tuple_to_roi(tpl: tuple[int, int, int, int]) -> tuple[slice, slice]:
@@ -46,52 +54,205 @@ def _tuple_to_cli_string(tpl: tuple[int, int, int, int]) -> str:
     return f"{tpl[0]}:{tpl[1]},{tpl[2]}:{tpl[3]}"
 
 
+# A log is compacted once it holds this many lines per distinct file; the
+# check runs on every _ROI_LOG_COMPACT_EVERY-th save to a log in a process.
+_ROI_LOG_COMPACT_RATIO = 10
+_ROI_LOG_COMPACT_EVERY = 50
+_roi_log_saves: dict[Path, int] = {}
+
+_RoiLog = dict[str, dict[str, tuple[int, int, int, int] | None]]
+
+
+def _roi_log_paths(log_file: Path) -> tuple[Path, Path | None]:
+    """
+    Returns (JSONL log, legacy log) for a log path. The log is written as
+    '<stem>.jsonl'; an older '<stem>.json' next to it is only ever read.
+    """
+    if log_file.suffix == ".json":
+        return log_file.with_suffix(".jsonl"), log_file
+    if log_file.suffix == ".jsonl":
+        return log_file, log_file.with_suffix(".json")
+    return log_file, None
+
+
+def _roi_log_entry(line: bytes) -> dict | None:
+    """Parses one ROI log line, or returns None if it is not a log entry."""
+    try:
+        entry = loads(line)
+    except json.JSONDecodeError:  # Also raised by orjson
+        return None
+    if isinstance(entry, dict) and isinstance(entry.get("file"), str):
+        return entry
+    return None
+
+
+def _parse_roi_log(raw: bytes, name: str) -> tuple[_RoiLog, int]:
+    """
+    Parses a ROI log, either one entry per line or the older single
+    {file: {...}} document. Returns the latest ROIs per file and the
+    number of lines read.
+    """
+    lines = raw.splitlines()
+    if lines and lines[0].strip() and _roi_log_entry(lines[0]) is None:
+        legacy: _RoiLog = loads(raw)
+        return legacy, len(lines)
+
+    data: _RoiLog = {}
+    for line in lines:
+        if not line.strip():
+            continue
+        entry = _roi_log_entry(line)
+        if entry is None:
+            print(f"Warning: Skipping malformed line in {name}")
+            continue
+        data[entry.pop("file")] = entry
+    return data, len(lines)
+
+
+def _write_roi_log(log_file: Path, data: _RoiLog):
+    """Atomically rewrites the ROI log with one line per file."""
+    write_atomic(
+        b"".join(dumps({"file": name, **rois}) + b"\n" for name, rois in data.items()),
+        log_file,
+    )
+
+
 def save_rois_to_log(
     log_file: Path,
     base_file: Path,
     top_roi: tuple[slice, slice] | None,
     bottom_roi: tuple[slice, slice] | None,
 ):
-    """Appends the ROIs for a given file to a central JSON log."""
-    data = {}
-    if log_file.exists():
-        try:
-            with log_file.open("r") as f:
-                data = json.load(f)
-        except json.JSONDecodeError:
-            print(f"Warning: Overwriting corrupted ROI log {log_file.name}")
-            data = {}
+    """
+    Records the ROIs for a given file in a central log.
 
-    data[base_file.name] = {
+    Each save appends a single JSON line to '<stem>.jsonl'; later lines
+    override earlier ones for the same file. A legacy '<stem>.json' log is
+    copied into the new log on first save and left untouched. Logs that
+    accumulate many superseded lines are compacted here, never on load.
+    """
+    jsonl_file, legacy_file = _roi_log_paths(log_file)
+    entry = {
+        "file": base_file.name,
         "top_roi": _roi_to_tuple(top_roi),
         "bottom_roi": _roi_to_tuple(bottom_roi),
     }
 
     try:
-        log_file.parent.mkdir(parents=True, exist_ok=True)
-        with log_file.open("w") as f:
-            json.dump(data, f, indent=4)
-        print(f"✅ Saved ROIs for {base_file.name} to {log_file.name}")
+        if not jsonl_file.parent.is_dir():
+            jsonl_file.parent.mkdir(parents=True, exist_ok=True)
+        if not jsonl_file.exists() and legacy_file and legacy_file.exists():
+            try:
+                seed, _ = _parse_roi_log(legacy_file.read_bytes(), legacy_file.name)
+                _write_roi_log(jsonl_file, seed)
+            except json.JSONDecodeError:
+                print(f"Warning: Ignoring corrupted ROI log {legacy_file.name}")
+
+        with open(jsonl_file, "ab") as f:
+            f.write(dumps(entry) + b"\n")
+        print(f"✅ Saved ROIs for {base_file.name} to {jsonl_file.name}")
     except Exception as e:
         print(f"Error saving ROI log: {e}", file=sys.stderr)
+        return
 
+    saves = _roi_log_saves.get(jsonl_file, 0) + 1
+    _roi_log_saves[jsonl_file] = saves
+    if saves % _ROI_LOG_COMPACT_EVERY == 0:
+        try:
+            data, n_lines = _parse_roi_log(jsonl_file.read_bytes(), jsonl_file.name)
+            if n_lines > _ROI_LOG_COMPACT_RATIO * max(len(data), 1):
+                _write_roi_log(jsonl_file, data)
+        except (OSError, json.JSONDecodeError):
+            pass  # Compaction is best-effort; the log is still valid
 
-def load_rois_from_log(
-    log_file: Path,
-) -> dict[str, dict[str, tuple[int, int, int, int] | None]]:
+
+def load_rois_from_log(log_file: Path) -> _RoiLog:
     """
     Loads the ROI log. Returns an empty dict if not found.
     Values for ROIs can be tuples or None.
+
+    Reads '<stem>.jsonl', falling back to a legacy '<stem>.json' log that
+    has not been saved to since. The log is never modified here.
     """
-    if not log_file.exists():
-        return {}
-    try:
-        with log_file.open("r") as f:
-            data: dict[str, dict[str, tuple[int, int, int, int] | None]] = json.load(f)
+    jsonl_file, legacy_file = _roi_log_paths(log_file)
+    for candidate in (jsonl_file, legacy_file):
+        if candidate is None or not candidate.exists():
+            continue
+        try:
+            data, _ = _parse_roi_log(candidate.read_bytes(), candidate.name)
+        except Exception as e:
+            print(f"Error loading ROI log: {e}", file=sys.stderr)
+            return {}
         return data
-    except Exception as e:
-        print(f"Error loading ROI log: {e}", file=sys.stderr)
-        return {}
+    return {}
+
+
+def _reference_spectrum(
+    mip_data: np.ndarray,
+    top_roi: tuple[slice, slice],
+    win: np.ndarray,
+    top_crop: np.ndarray | None = None,
+) -> np.ndarray:
+    """
+    Returns the FFT of the windowed reference (top) crop. Re-aligning a moved
+    bottom ROI against the same MIP and top ROI reuses the previous result.
+
+    The cache key includes a CRC of the crop, which costs far less than the
+    FFT and catches in-place edits of the same MIP array (e.g. re-filtering).
+    """
+    from scipy import fft as sp_fft
+
+    global _ref_spectrum_cache
+    if top_crop is None:
+        top_crop = mip_data[top_roi[0], top_roi[1]]
+    key = (
+        id(mip_data),
+        mip_data.shape,
+        mip_data.dtype.str,
+        _roi_to_tuple(top_roi),
+        win.shape,
+        zlib.crc32(np.ascontiguousarray(top_crop)),
+    )
+    if _ref_spectrum_cache is not None and _ref_spectrum_cache[0] == key:
+        return _ref_spectrum_cache[1]
+
+    spectrum = sp_fft.rfft2(top_crop.astype(np.float32, copy=False) * win)
+    _ref_spectrum_cache = (key, spectrum)
+    return spectrum
+
+
+def _correlation_shift(
+    ref_spectrum: np.ndarray, moving_spectrum: np.ndarray, shape: tuple[int, int]
+) -> np.ndarray:
+    """
+    Returns the (dy, dx) shift that registers the moving crop onto the
+    reference, given both crops' rfft2 spectra.
+
+    The integer peak of the (unnormalized) circular cross-correlation is
+    refined with a 3-point parabolic fit along each axis, which is much
+    cheaper than upsampled DFT refinement and ample for whole-pixel ROIs.
+    """
+    from scipy import fft as sp_fft
+
+    cc = sp_fft.irfft2(ref_spectrum * moving_spectrum.conj(), s=shape)
+    peak = np.unravel_index(np.argmax(cc), shape)
+    centre = cc[peak]
+
+    shift = np.empty(2)
+    for axis, size in enumerate(shape):
+        before, after = list(peak), list(peak)
+        before[axis] = (peak[axis] - 1) % size
+        after[axis] = (peak[axis] + 1) % size
+        left, right = cc[tuple(before)], cc[tuple(after)]
+        denom = left - 2 * centre + right
+        offset = 0.5 * (left - right) / denom if denom < 0 else 0.0
+
+        # Peaks past the midpoint are negative shifts (circular correlation)
+        whole = int(peak[axis])
+        if whole > size // 2:
+            whole -= size
+        shift[axis] = whole + offset
+    return shift
 
 
 def align_rois(
@@ -99,6 +260,9 @@ def align_rois(
     top_roi: tuple[slice, slice],
     bottom_roi: tuple[slice, slice],
     max_shift: float = 60.0,
+    *,
+    top_crop: np.ndarray | None = None,
+    bottom_crop: np.ndarray | None = None,
 ) -> tuple[slice, slice]:
     """
     Calculates the pixel shift between two ROIs from a 2D MIP
@@ -113,34 +277,47 @@ def align_rois(
         top_roi: (slice, slice) for the reference ROI (Y, X).
         bottom_roi: (slice, slice) for the target ROI (Y, X).
         max_shift: Maximum allowable shift in pixels.
+        top_crop: Optional mip_data[top_roi], if the caller already has it.
+        bottom_crop: Optional mip_data[bottom_roi], if the caller already has it.
 
     Returns:
         The adjusted (slice, slice) for the bottom ROI.
     """
+    # Imported here: ROI logging/ticket helpers in this module are used by the
+    # CLI and job submitters, which should not pay for scipy/scikit-image.
+    from scipy import fft as sp_fft
+    from skimage.filters import window
+
     print("Aligning ROIs using 2D MIP...")
 
     try:
-        # Crop the data from the MIP for registration
-        top_crop = mip_data[top_roi[0], top_roi[1]].astype(float)
-        bottom_crop = mip_data[bottom_roi[0], bottom_roi[1]].astype(float)
+        # Crop the data from the MIP for registration, unless passed in
+        if top_crop is None:
+            top_crop = mip_data[top_roi[0], top_roi[1]]
+        if bottom_crop is None:
+            bottom_crop = mip_data[bottom_roi[0], bottom_roi[1]]
+        top_shape = top_crop.shape
+        # float32 keeps the FFTs in complex64
+        bottom_crop = bottom_crop.astype(np.float32, copy=False)
 
         # Ensure shapes match (they should if ROISelector was used)
-        if top_crop.shape != bottom_crop.shape:
+        if top_shape != bottom_crop.shape:
             print("  ⚠️ ROI shapes do not match. Skipping alignment.")
             return bottom_roi
 
         # --- Robustness 1: Apply Windowing ---
-        # "Hann" window fades edges to zero, removing "box" artifacts from FFT
-        w_top = window("hann", top_crop.shape)
-        w_bot = window("hann", bottom_crop.shape)
-
-        shift, _, _ = phase_cross_correlation(
-            top_crop * w_top,
-            bottom_crop * w_bot,
-            upsample_factor=10,
-            normalization=None,  # type: ignore # Often better for windowed data
-        )
-        dy, dx = shift
+        # "Hann" window fades edges to zero, removing "box" artifacts from FFT.
+        # Both crops share a shape, so one window serves both.
+        win = window("hann", bottom_crop.shape).astype(np.float32)
+
+        # Real input, so rfft2 halves the spectra; the reference one is cached.
+        # Unnormalized correlation is often better for windowed data.
+        with sp_fft.set_workers(-1):
+            dy, dx = _correlation_shift(
+                _reference_spectrum(mip_data, top_roi, win, top_crop),
+                sp_fft.rfft2(bottom_crop * win),
+                bottom_crop.shape,
+            )
         shift_magnitude = np.sqrt(dy**2 + dx**2)
 
         print(f"  Detected shift (dy, dx): ({dy:.2f}, {dx:.2f}) pixels.")
@@ -155,18 +332,13 @@ def align_rois(
             )
             return bottom_roi
 
-        # Apply valid shift
-        old_y_start, old_y_end = bottom_roi[0].start, bottom_roi[0].stop
-        old_x_start, old_x_end = bottom_roi[1].start, bottom_roi[1].stop
-
-        new_y_start = old_y_start - int(round(dy))
-        new_y_end = old_y_end - int(round(dy))
-        new_x_start = old_x_start - int(round(dx))
-        new_x_end = old_x_end - int(round(dx))
+        # Apply valid shift (each axis rounded once; plain ints for the log)
+        step_y, step_x = int(round(dy)), int(round(dx))
+        y_roi, x_roi = bottom_roi
 
         aligned_bottom_roi = (
-            slice(new_y_start, new_y_end),
-            slice(new_x_start, new_x_end),
+            slice(y_roi.start - step_y, y_roi.stop - step_y),
+            slice(x_roi.start - step_x, x_roi.stop - step_x),
         )
         print(f"  ✅ Adjusted Bottom ROI: {aligned_bottom_roi}")
         return aligned_bottom_roi
@@ -200,9 +372,13 @@ def process_rois_from_selector(
     top_roi_unaligned = unaligned_rois[0]
     bottom_roi_unaligned = unaligned_rois[1]
 
-    # Check if ROIs are valid by sampling the MIP
-    top_mean = np.mean(mip_data[top_roi_unaligned[0], top_roi_unaligned[1]])
-    bottom_mean = np.mean(mip_data[bottom_roi_unaligned[0], bottom_roi_unaligned[1]])
+    # Check if ROIs are valid by sampling the MIP (basic slicing: views, no copies)
+    top_crop = mip_data[top_roi_unaligned]
+    bottom_crop = mip_data[bottom_roi_unaligned]
+    # float32 accumulation is plenty for a threshold and halves the traffic
+    # of numpy's default float64 upcast for uint16 MIPs
+    top_mean = top_crop.mean(dtype=np.float32)
+    bottom_mean = bottom_crop.mean(dtype=np.float32)
 
     top_roi_valid = top_mean > valid_threshold
     bottom_roi_valid = bottom_mean > valid_threshold
@@ -220,6 +396,8 @@ def process_rois_from_selector(
             mip_data,
             top_roi_unaligned,
             bottom_roi_unaligned,
+            top_crop=top_crop,
+            bottom_crop=bottom_crop,
         )
         final_top_roi = top_roi_unaligned
         print("\n✅ ROI Processing complete.")
@@ -172,266 +172,298 @@ while true
         fclose(fid);
         job = jsondecode(char(raw'));
 
-        if isfield(job, 'parameters')
-            p = job.parameters;
+        % A ticket may chain stages (e.g. crop then deskew) that run back to
+        % back in this worker; a plain ticket is a single stage.
+        jobType = safelyGetParam(job, 'jobType', 'deskew');
+        if isfield(job, 'stages')
+            stages = job.stages;
+            if isstruct(stages)
+                stages = num2cell(stages);
+            end
+            % A 'pipeline' stage hands its ticket to a background worker,
+            % which moves it itself; that cannot be chained with other stages.
+            for iStage = 1:numel(stages)
+                if strcmp(safelyGetParam(stages{iStage}, 'jobType', 'deskew'), 'pipeline')
+                    error('A ''pipeline'' job cannot be a stage of a multi-stage ticket.');
+                end
+            end
         else
-            p = struct();
+            stages = {job};
         end
 
-        jobType = safelyGetParam(job, 'jobType', 'deskew');
-
-        switch jobType
-            case 'crop'
-                % --- CROPPING JOB ---
-                logMsg('         Type: OPM Cropping');
-
-                % Check if BigTiff
-                isBigTiff = endsWith(job.dataDir, '.ome.tif', 'IgnoreCase', true);
-
-                if isBigTiff
-                    logMsg('         -> Mode: BigTiff Split (Parallel)');
-                    % Calls the new BigTiff cropper (Requires 'job' struct)
-                    run_bigtiff_cropper(job);
-                else
-                    logMsg('         -> Mode: Standard PetaKit Crop');
-                    % Calls the legacy cropper (Requires 'path' string)
-                    run_petakit_cropper(srcPath);
-                end
+        for iStage = 1:numel(stages)
+            job = stages{iStage};
 
-            case 'pipeline'
-                % --- UNIFIED GPU PIPELINE JOB ---
-                logMsg('         Type: Unified GPU Pipeline (RAM Disk)');
-                val_shm    = safelyGetParam(p, 'shm_path', '');
-                val_psfs   = safelyGetParam(p, 'psf_paths', {});
-                val_xyPix  = safelyGetParam(p, 'xy_pixel_size', 0.136);
-                val_zStep  = safelyGetParam(p, 'z_step_um', 0.3);
-                val_angle  = safelyGetParam(p, 'sheet_angle_deg', 60.0);
-                val_interp = safelyGetParam(p, 'interp_method', 'cubic');
-                val_method = safelyGetParam(p, 'rl_method', 'simple');
-                if strcmp(val_method, 'omw')
-                    default_iter = 2;
-                else
-                    default_iter = 25;
-                end
-                val_iter   = safelyGetParam(p, 'iterations', default_iter);
-                val_zarr   = safelyGetParam(p, 'save_zarr', true);
-                val_debug  = safelyGetParam(p, 'debug', false);
-                val_dzPSF  = safelyGetParam(p, 'dz_psf', []);
+            if isfield(job, 'parameters')
+                p = job.parameters;
+            else
+                p = struct();
+            end
 
-                if isempty(val_shm)
-                    error('No /dev/shm/ path provided for pipeline job.');
-                end
+            jobType = safelyGetParam(job, 'jobType', 'deskew');
 
-                % outputFn corresponds to dataDir / baseName (which will be a TIF)
-                % The ticket provides dataDir as the target directory (e.g. cell_1/Bot)
-                % and baseName as the file name (e.g. cell_MMStack_Pos0_T0000_C0_bot.tif)
-                outFn = fullfile(job.dataDir, job.baseName);
-
-                % Ensure array is correct
-                if iscell(val_psfs) && ~isempty(val_psfs)
-                    psfFn = val_psfs{1};
-                elseif isstring(val_psfs) || ischar(val_psfs)
-                    psfFn = val_psfs;
-                else
-                    psfFn = '';
-                end
+            switch jobType
+                case 'crop'
+                    % --- CROPPING JOB ---
+                    logMsg('         Type: OPM Cropping');
 
-                % dz_psf is required whenever a PSF (i.e. deconvolution) is
-                % requested -- a silent wrong default here previously caused
-                % the decon step to resample against the wrong z-geometry.
-                if ~isempty(psfFn) && isempty(val_dzPSF)
-                    error(['pipeline job requests deconvolution (psf_paths set) but is ', ...
-                        'missing required "dz_psf" parameter (the PSF''s own z-step, in um).']);
-                end
+                    % Check if BigTiff
+                    isBigTiff = endsWith(job.dataDir, '.ome.tif', 'IgnoreCase', true);
 
-                % --- GPU CONCURRENCY LOCK ---
-                % Only one 'pipeline' job may run on this server's GPU at a time
-                % (deconvolution + DSR both allocate full-volume GPU buffers;
-                % running >1 concurrently reliably OOMs the device). Each server
-                % process owns exactly one physical GPU (see local_gpu_worker.py),
-                % so this lock is scoped per-server via PETAKIT_SERVER_ID.
-                maxGpuJobs = str2double(getenv('PETAKIT_MAX_GPU_PIPELINE_JOBS'));
-                if isnan(maxGpuJobs)
-                    maxGpuJobs = 1;
-                end
-                lockAcquired = false;
-                while ~lockAcquired
-                    existingLocks = dir(fullfile(gpu_lock_dir, '*.lock'));
-                    if numel(existingLocks) < maxGpuJobs
-                        lockName = fullfile(gpu_lock_dir, [currentFile '.lock']);
-                        lfid = fopen(lockName, 'w');
-                        if lfid > 0
-                            fclose(lfid);
-                            lockAcquired = true;
-                        end
+                    if isBigTiff
+                        logMsg('         -> Mode: BigTiff Split (Parallel)');
+                        % Calls the new BigTiff cropper (Requires 'job' struct)
+                        run_bigtiff_cropper(job);
+                    else
+                        logMsg('         -> Mode: Standard PetaKit Crop');
+                        % Calls the legacy cropper (Requires 'path' string)
+                        run_petakit_cropper(srcPath);
                     end
-                    if ~lockAcquired
-                        pause(1 + rand());
+
+                case 'pipeline'
+                    % --- UNIFIED GPU PIPELINE JOB ---
+                    logMsg('         Type: Unified GPU Pipeline (RAM Disk)');
+                    val_shm    = safelyGetParam(p, 'shm_path', '');
+                    val_psfs   = safelyGetParam(p, 'psf_paths', {});
+                    val_xyPix  = safelyGetParam(p, 'xy_pixel_size', 0.136);
+                    val_zStep  = safelyGetParam(p, 'z_step_um', 0.3);
+                    val_angle  = safelyGetParam(p, 'sheet_angle_deg', 60.0);
+                    val_interp = safelyGetParam(p, 'interp_method', 'cubic');
+                    val_method = safelyGetParam(p, 'rl_method', 'simple');
+                    if strcmp(val_method, 'omw')
+                        default_iter = 2;
+                    else
+                        default_iter = 25;
                     end
-                end
+                    val_iter   = safelyGetParam(p, 'iterations', default_iter);
+                    val_zarr   = safelyGetParam(p, 'save_zarr', true);
+                    val_debug  = safelyGetParam(p, 'debug', false);
+                    val_dzPSF  = safelyGetParam(p, 'dz_psf', []);
 
-                f = parfeval(pool, @run_gpu_pipeline_async, 0, activePath, done_dir, fail_dir, val_shm, outFn, psfFn, gpu_lock_dir, currentFile, ...
-                    'xyPixelSize', val_xyPix, ...
-                    'z_step_um', val_zStep, ...
-                    'DeconIter', val_iter, ...
-                    'RLMethod', val_method, ...
-                    'SkewAngle', val_angle, ...
-                    'interpMethod', val_interp, ...
-                    'saveZarr', val_zarr, ...
-                    'debug', val_debug, ...
-                    'dzPSF', val_dzPSF);
-
-            case 'decon'
-                % --- DECONVOLUTION JOB ---
-                logMsg('         Type: Deconvolution');
-                val_resDir = safelyGetParam(p, 'result_dir_name', 'decon');
-                val_chans  = safelyGetParam(p, 'channel_patterns', {job.baseName});
-                val_psfs   = safelyGetParam(p, 'psf_paths', {});
-                val_method = safelyGetParam(p, 'rl_method', 'simple');
-                if strcmp(val_method, 'omw')
-                    default_iter = 2;
-                else
-                    default_iter = 25;
-                end
-                val_iter   = safelyGetParam(p, 'iterations', default_iter);
-                val_gpu    = safelyGetParam(p, 'gpu_job', true);
-                val_skewed = safelyGetParam(p, 'skewed', true);
-                val_16bit  = safelyGetParam(p, 'save_16bit', true);
-
-                if isstring(val_chans), val_chans = cellstr(val_chans); end
-                if isstring(val_psfs), val_psfs = cellstr(val_psfs); end
-
-                % Ensure number of PSFs matches number of channels
-                if numel(val_chans) > 1 && numel(val_psfs) == 1
-                    logMsg('         [Decon] Broadcasting single PSF to %d channels.', numel(val_chans));
-                    val_psfs = repmat(val_psfs, 1, numel(val_chans));
-                end
+                    if isempty(val_shm)
+                        error('No /dev/shm/ path provided for pipeline job.');
+                    end
 
-                XR_decon_data_wrapper( ...
-                    {job.dataDir}, ...
-                    'resultDirName', val_resDir, ...
-                    'channelPatterns', val_chans, ...
-                    'psfFullpaths', val_psfs, ...
-                    'deconIter', val_iter, ...
-                    'GPUJob', val_gpu, ...
-                    'skewed', val_skewed, ...
-                    'RLMethod', val_method, ...
-                    'save16bit', val_16bit, ...
-                    'parseCluster', false, ...
-                    'parseParfor', true, ...
-                    'masterCompute', true, ...
-                    'cpusPerTask', numCPUs ...
-                );
-
-            otherwise
-                % --- DESKEW / DECONVOLUTION / ROTATION PIPELINE ---
-
-                % 1. Extract Shared Parameters
-                val_xy        = safelyGetParam(p, 'xy_pixel_size', 0.136);
-                val_dz        = safelyGetParam(p, 'z_step_um', 1.0);
-                val_ang       = safelyGetParam(p, 'sheet_angle_deg', 60.0);
-                val_chans     = safelyGetParam(p, 'channel_patterns', {job.baseName});
-                if ischar(val_chans) || isstring(val_chans)
-                    val_chans = {val_chans};
-                end
+                    % outputFn corresponds to dataDir / baseName (which will be a TIF)
+                    % The ticket provides dataDir as the target directory (e.g. cell_1/Bot)
+                    % and baseName as the file name (e.g. cell_MMStack_Pos0_T0000_C0_bot.tif)
+                    outFn = fullfile(job.dataDir, job.baseName);
+
+                    % Ensure array is correct
+                    if iscell(val_psfs) && ~isempty(val_psfs)
+                        psfFn = val_psfs{1};
+                    elseif isstring(val_psfs) || ischar(val_psfs)
+                        psfFn = val_psfs;
+                    else
+                        psfFn = '';
+                    end
 
-                % Decon Params
-                val_psfPath   = safelyGetParam(p, 'psf_path', '');
-                val_runDecon  = safelyGetParam(p, 'run_decon', ~isempty(val_psfPath));
-                % Deskew/Rotate Params
-                val_deskew    = safelyGetParam(p, 'deskew', true);
-                val_rotate    = safelyGetParam(p, 'rotate', true);
-                val_interp    = safelyGetParam(p, 'interp_method', 'cubic');
-                val_method    = safelyGetParam(p, 'rl_method', 'simple');
-                if strcmp(val_method, 'omw')
-                    default_iter = 2;
-                else
-                    default_iter = 25;
-                end
-                val_iter      = safelyGetParam(p, 'decon_iter', default_iter);
-                val_dsDir     = safelyGetParam(p, 'ds_dir_name', 'DS');
-                val_dsrDir    = safelyGetParam(p, 'dsr_dir_name', 'DSR');
+                    % dz_psf is required whenever a PSF (i.e. deconvolution) is
+                    % requested -- a silent wrong default here previously caused
+                    % the decon step to resample against the wrong z-geometry.
+                    if ~isempty(psfFn) && isempty(val_dzPSF)
+                        error(['pipeline job requests deconvolution (psf_paths set) but is ', ...
+                            'missing required "dz_psf" parameter (the PSF''s own z-step, in um).']);
+                    end
 
-                % ✅ Axis Order Parameters
-                val_inputAxis  = safelyGetParam(p, 'input_axis_order', 'yxz');
-                val_outputAxis = safelyGetParam(p, 'output_axis_order', 'yxz');
+                    % --- GPU CONCURRENCY LOCK ---
+                    % Only one 'pipeline' job may run on this server's GPU at a time
+                    % (deconvolution + DSR both allocate full-volume GPU buffers;
+                    % running >1 concurrently reliably OOMs the device). Each server
+                    % process owns exactly one physical GPU (see local_gpu_worker.py),
+                    % so this lock is scoped per-server via PETAKIT_SERVER_ID.
+                    maxGpuJobs = str2double(getenv('PETAKIT_MAX_GPU_PIPELINE_JOBS'));
+                    if isnan(maxGpuJobs)
+                        maxGpuJobs = 1;
+                    end
+                    lockAcquired = false;
+                    while ~lockAcquired
+                        existingLocks = dir(fullfile(gpu_lock_dir, '*.lock'));
+                        if numel(existingLocks) < maxGpuJobs
+                            lockName = fullfile(gpu_lock_dir, [currentFile '.lock']);
+                            lfid = fopen(lockName, 'w');
+                            if lfid > 0
+                                fclose(lfid);
+                                lockAcquired = true;
+                            end
+                        end
+                        if ~lockAcquired
+                            pause(1 + rand());
+                        end
+                    end
 
-                % 2. Execution logic
-                current_input_dir = job.dataDir;
+                    f = parfeval(pool, @run_gpu_pipeline_async, 0, activePath, done_dir, fail_dir, val_shm, outFn, psfFn, gpu_lock_dir, currentFile, ...
+                        'xyPixelSize', val_xyPix, ...
+                        'z_step_um', val_zStep, ...
+                        'DeconIter', val_iter, ...
+                        'RLMethod', val_method, ...
+                        'SkewAngle', val_angle, ...
+                        'interpMethod', val_interp, ...
+                        'saveZarr', val_zarr, ...
+                        'debug', val_debug, ...
+                        'dzPSF', val_dzPSF);
+
+                case 'decon'
+                    % --- DECONVOLUTION JOB ---
+                    logMsg('         Type: Deconvolution');
+                    val_resDir = safelyGetParam(p, 'result_dir_name', 'decon');
+                    val_chans  = safelyGetParam(p, 'channel_patterns', {job.baseName});
+                    val_psfs   = safelyGetParam(p, 'psf_paths', {});
+                    val_method = safelyGetParam(p, 'rl_method', 'simple');
+                    if strcmp(val_method, 'omw')
+                        default_iter = 2;
+                    else
+                        default_iter = 25;
+                    end
+                    val_iter   = safelyGetParam(p, 'iterations', default_iter);
+                    val_gpu    = safelyGetParam(p, 'gpu_job', true);
+                    val_skewed = safelyGetParam(p, 'skewed', true);
+                    val_16bit  = safelyGetParam(p, 'save_16bit', true);
 
-                if val_runDecon && ~isempty(val_psfPath)
-                    % --- STEP A: Deconvolution (Skewed) ---
-                    logMsg('         Type: Deconvolution (Skewed Mode)');
-                    deconDirName = 'Decon'; % Consistent output name for pipeline
+                    if isstring(val_chans), val_chans = cellstr(val_chans); end
+                    if isstring(val_psfs), val_psfs = cellstr(val_psfs); end
 
                     % Ensure number of PSFs matches number of channels
-                    val_psfs = {val_psfPath};
-                    if numel(val_chans) > 1
+                    if numel(val_chans) > 1 && numel(val_psfs) == 1
                         logMsg('         [Decon] Broadcasting single PSF to %d channels.', numel(val_chans));
                         val_psfs = repmat(val_psfs, 1, numel(val_chans));
                     end
 
-                    val_gpuDecon = safelyGetParam(p, 'gpu_decon', false);
-
                     XR_decon_data_wrapper( ...
-                        {current_input_dir}, ...
+                        {job.dataDir}, ...
+                        'resultDirName', val_resDir, ...
                         'channelPatterns', val_chans, ...
                         'psfFullpaths', val_psfs, ...
                         'deconIter', val_iter, ...
-                        'xyPixelSize', val_xy, ...
-                        'dz', val_dz, ...
-                        'skewAngle', val_ang, ...
-                        'skewed', true, ...
-                        'GPUJob', val_gpuDecon, ...
+                        'GPUJob', val_gpu, ...
+                        'skewed', val_skewed, ...
                         'RLMethod', val_method, ...
-                        'save16bit', true, ...
-                        'resultDirName', deconDirName, ...
+                        'save16bit', val_16bit, ...
                         'parseCluster', false, ...
                         'parseParfor', true, ...
                         'masterCompute', true, ...
                         'cpusPerTask', numCPUs ...
                     );
 
-                    % Update input for the next step to point to the deconvolved results
-                    current_input_dir = fullfile(job.dataDir, deconDirName);
-                end
+                otherwise
+                    % --- DESKEW / DECONVOLUTION / ROTATION PIPELINE ---
 
-                if val_deskew || val_rotate
-                    % --- STEP B: Deskew / Rotate ---
-                    logMsg('         Type: Deskew/Rotate');
+                    % 1. Extract Shared Parameters
+                    val_xy        = safelyGetParam(p, 'xy_pixel_size', 0.136);
+                    val_dz        = safelyGetParam(p, 'z_step_um', 1.0);
+                    val_ang       = safelyGetParam(p, 'sheet_angle_deg', 60.0);
+                    val_chans     = safelyGetParam(p, 'channel_patterns', {job.baseName});
+                    if ischar(val_chans) || isstring(val_chans)
+                        val_chans = {val_chans};
+                    end
 
-                    % Scan Geometry Parameters (from JSON ticket)
-                    val_objScan   = safelyGetParam(p, 'objective_scan', false);
-                    val_zStage    = safelyGetParam(p, 'z_stage_scan', false);
-                    val_reverse   = safelyGetParam(p, 'reverse', false);
+                    % Decon Params
+                    val_psfPath   = safelyGetParam(p, 'psf_path', '');
+                    val_runDecon  = safelyGetParam(p, 'run_decon', ~isempty(val_psfPath));
+                    % Deskew/Rotate Params
+                    val_deskew    = safelyGetParam(p, 'deskew', true);
+                    val_rotate    = safelyGetParam(p, 'rotate', true);
+                    val_interp    = safelyGetParam(p, 'interp_method', 'cubic');
+                    val_method    = safelyGetParam(p, 'rl_method', 'simple');
+                    if strcmp(val_method, 'omw')
+                        default_iter = 2;
+                    else
+                        default_iter = 25;
+                    end
+                    val_iter      = safelyGetParam(p, 'decon_iter', default_iter);
+                    val_dsDir     = safelyGetParam(p, 'ds_dir_name', 'DS');
+                    val_dsrDir    = safelyGetParam(p, 'dsr_dir_name', 'DSR');
+
+                    % ✅ Axis Order Parameters
+                    val_inputAxis  = safelyGetParam(p, 'input_axis_order', 'yxz');
+                    val_outputAxis = safelyGetParam(p, 'output_axis_order', 'yxz');
+
+                    % 2. Execution logic
+                    current_input_dir = job.dataDir;
+
+                    if val_runDecon && ~isempty(val_psfPath)
+                        % --- STEP A: Deconvolution (Skewed) ---
+                        logMsg('         Type: Deconvolution (Skewed Mode)');
+                        deconDirName = 'Decon'; % Consistent output name for pipeline
+
+                        % Ensure number of PSFs matches number of channels
+                        val_psfs = {val_psfPath};
+                        if numel(val_chans) > 1
+                            logMsg('         [Decon] Broadcasting single PSF to %d channels.', numel(val_chans));
+                            val_psfs = repmat(val_psfs, 1, numel(val_chans));
+                        end
 
-                    XR_deskew_rotate_data_wrapper( ...
-                        {current_input_dir}, ...
-                        'DSDirName', val_dsDir, ...
-                        'DSRDirName', val_dsrDir, ...
-                        'channelPatterns', val_chans, ...
-                        'deskew', val_deskew, ...
-                        'rotate', val_rotate, ...
-                        'xyPixelSize', val_xy, ...
-                        'dz', val_dz, ...
-                        'skewAngle', val_ang, ...
-                        'interpMethod', val_interp, ...
-                        'inputAxisOrder', val_inputAxis, ...
-                        'outputAxisOrder', val_outputAxis, ...
-                        'objectiveScan', val_objScan, ...
-                        'zStageScan', val_zStage, ...
-                        'reverse', val_reverse, ...
-                        'DSRCombined', true, ...
-                        'save16bit', true, ...
-                        'save3DStack', true, ...
-                        'saveMIP', false, ...
-                        'parseCluster', false, ...
-                        'parseParfor', false, ...
-                        'masterCompute', true, ...
-                        'cpusPerTask', numCPUs ...
-                    );
-                end
-        end % End switch jobType
+                        val_gpuDecon = safelyGetParam(p, 'gpu_decon', false);
+
+                        XR_decon_data_wrapper( ...
+                            {current_input_dir}, ...
+                            'channelPatterns', val_chans, ...
+                            'psfFullpaths', val_psfs, ...
+                            'deconIter', val_iter, ...
+                            'xyPixelSize', val_xy, ...
+                            'dz', val_dz, ...
+                            'skewAngle', val_ang, ...
+                            'skewed', true, ...
+                            'GPUJob', val_gpuDecon, ...
+                            'RLMethod', val_method, ...
+                            'save16bit', true, ...
+                            'resultDirName', deconDirName, ...
+                            'parseCluster', false, ...
+                            'parseParfor', true, ...
+                            'masterCompute', true, ...
+                            'cpusPerTask', numCPUs ...
+                        );
+
+                        % Update input for the next step to point to the deconvolved results
+                        current_input_dir = fullfile(job.dataDir, deconDirName);
+                    end
+
+                    if val_deskew || val_rotate
+                        % --- STEP B: Deskew / Rotate ---
+                        logMsg('         Type: Deskew/Rotate');
+
+                        % Scan Geometry Parameters (from JSON ticket)
+                        val_objScan   = safelyGetParam(p, 'objective_scan', false);
+                        val_zStage    = safelyGetParam(p, 'z_stage_scan', false);
+                        val_reverse   = safelyGetParam(p, 'reverse', false);
+
+                        % Output Format (Zarr chunks allow partial-region reads downstream)
+                        val_saveZarr  = safelyGetParam(p, 'save_zarr', false);
+                        zarrArgs = {'saveZarr', val_saveZarr};
+                        val_blockSize = safelyGetParam(p, 'block_size', []);
+                        if val_saveZarr && ~isempty(val_blockSize)
+                            zarrArgs = [zarrArgs, {'BlockSize', val_blockSize(:)'}];
+                        end
+
+                        XR_deskew_rotate_data_wrapper( ...
+                            {current_input_dir}, ...
+                            'DSDirName', val_dsDir, ...
+                            'DSRDirName', val_dsrDir, ...
+                            'channelPatterns', val_chans, ...
+                            'deskew', val_deskew, ...
+                            'rotate', val_rotate, ...
+                            'xyPixelSize', val_xy, ...
+                            'dz', val_dz, ...
+                            'skewAngle', val_ang, ...
+                            'interpMethod', val_interp, ...
+                            'inputAxisOrder', val_inputAxis, ...
+                            'outputAxisOrder', val_outputAxis, ...
+                            'objectiveScan', val_objScan, ...
+                            'zStageScan', val_zStage, ...
+                            'reverse', val_reverse, ...
+                            'DSRCombined', true, ...
+                            'save16bit', true, ...
+                            'save3DStack', true, ...
+                            'saveMIP', false, ...
+                            zarrArgs{:}, ...
+                            'parseCluster', false, ...
+                            'parseParfor', false, ...
+                            'masterCompute', true, ...
+                            'cpusPerTask', numCPUs ...
+                        );
+                    end
+            end % End switch jobType
+        end % End stages loop
 
         if ~strcmp(jobType, 'pipeline')
             movefile(activePath, fullfile(done_dir, currentFile));
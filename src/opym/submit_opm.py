@@ -8,15 +8,28 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
 import re
+import string
 import sys
 import time
 from pathlib import Path
 
+try:
+    import ijson  # Streams large metadata files instead of loading them whole
+except ImportError:  # Optional: install with `uv pip install -e .[fast]`
+    ijson = None
+
 # --- Configuration ---
 # Matches your system's folder structure
 QUEUE_DIR = Path.home() / "petakit_jobs" / "queue"
 
+# Characters not allowed in a ticket file name
+_UNSAFE_NAME_RE = re.compile(r"[^\w\-_\.]")
+# The same rule as a byte table, for ASCII names
+_SAFE_ASCII = (string.ascii_letters + string.digits + "_-.").encode()
+_SANITIZE_TABLE = bytes(c if c in _SAFE_ASCII else ord("_") for c in range(256))
+
 # Default Physics Parameters (Fallback if metadata fails)
 DEFAULTS = {
     "angle": 30.0,
@@ -26,34 +39,69 @@ DEFAULTS = {
 }
 
 
+def _sanitize_name(name: str) -> str:
+    """Replaces characters not allowed in a ticket file name with '_'."""
+    if name.isascii():  # Common case: one C-level byte translation
+        return name.encode("ascii").translate(_SANITIZE_TABLE).decode("ascii")
+    return _UNSAFE_NAME_RE.sub("_", name)
+
+
+def _read_z_step(target_file) -> object:
+    """
+    Returns the top-level 'stepSizeUm' value of a settings JSON file, or
+    'zStep_um' if the former is missing or empty.
+
+    With ijson installed the file is streamed, stopping at 'stepSizeUm',
+    so a large '*_metadata.txt' is never held in memory.
+    """
+    if ijson is not None:
+        try:
+            fallback = None
+            with open(target_file, "rb") as f:
+                for prefix, event, value in ijson.parse(f):
+                    if event not in ("number", "string"):
+                        continue
+                    if prefix == "stepSizeUm" and value:
+                        return value
+                    if prefix == "zStep_um":
+                        fallback = value
+            return fallback
+        except (ijson.JSONError, UnicodeDecodeError):
+            pass  # e.g. latin-1 text; parse it whole below
+
+    with open(target_file, encoding="latin-1") as f:
+        data = json.load(f)
+    return data.get("stepSizeUm") or data.get("zStep_um")
+
+
 def parse_z_step(data_dir):
     """
     Lightweight scan of AcqSettings.txt to find Z-step.
     """
     try:
-        # 1. Look for base name to find metadata file
-        # Try finding the metadata file directly in parent (common structure)
+        # 1. Prefer AcqSettings.txt (often cleaner); only if it is missing,
+        # take the first '*_metadata.txt' in the parent (common structure)
         parent = data_dir.parent
-        meta_files = list(parent.glob("*_metadata.txt"))
-
-        # If we can't find it easily, try the AcqSettings.txt which is often cleaner
-        acq_file = parent / "AcqSettings.txt"
-
-        target_file = None
-        if acq_file.exists():
-            target_file = acq_file
-        elif meta_files:
-            target_file = meta_files[0]
+        target_file = parent / "AcqSettings.txt"
+
+        if not target_file.exists():
+            with os.scandir(parent) as entries:
+                target_file = next(
+                    (
+                        entry.path
+                        for entry in entries
+                        if entry.name.endswith("_metadata.txt")
+                        and not entry.name.startswith(".")
+                        and entry.is_file()
+                    ),
+                    None,
+                )
 
         if not target_file:
             return None
 
-        # 2. Parse the file
-        with open(target_file, encoding="latin-1") as f:
-            data = json.load(f)
-
-        # Check standard keys
-        step = data.get("stepSizeUm") or data.get("zStep_um")
+        # 2. Parse the file for the standard keys
+        step = _read_z_step(target_file)
         return float(step) if step else None
 
     except Exception:
@@ -109,6 +157,9 @@ def main():
     if not args.input_dir.exists():
         print(f"Error: {args.input_dir} not found.")
         sys.exit(1)
+    # abspath() collapses '..' (so .name is meaningful) without resolve()'s
+    # per-component stats on network mounts
+    args.input_dir = Path(os.path.abspath(args.input_dir))
 
     # 2. Determine Z-Step
     z_step = args.z
@@ -134,7 +185,7 @@ def main():
     # 5. Construct Payload
     payload = {
         "jobType": "deskew",
-        "dataDir": str(args.input_dir.resolve()),
+        "dataDir": str(args.input_dir),
         "baseName": base_name,
         "parameters": {
             "xy_pixel_size": args.xy,
@@ -155,17 +206,22 @@ def main():
     }
 
     # 5. Write to Queue
-    QUEUE_DIR.mkdir(parents=True, exist_ok=True)
+    if not QUEUE_DIR.is_dir():
+        QUEUE_DIR.mkdir(parents=True, exist_ok=True)
 
-    timestamp = int(time.time() * 1000)
+    timestamp = time.time_ns() // 1_000_000  # Integer ms, no float rounding
     # Clean filename (replace non-alphanumeric with _)
-    safe_name = re.sub(r"[^\w\-_\.]", "_", base_name)
+    safe_name = _sanitize_name(base_name)
     job_filename = f"{safe_name}_{timestamp}.json"
     job_file = QUEUE_DIR / job_filename
 
+    # Write a hidden temp file and rename it into place, so the server
+    # (which lists visible '*.json' only) never reads a partial ticket.
+    tmp_file = QUEUE_DIR / f".{job_filename}.{os.getpid()}.tmp"
     try:
-        with open(job_file, "w") as f:
+        with open(tmp_file, "w") as f:
             json.dump(payload, f, indent=4)
+        os.replace(tmp_file, job_file)
         print(f"Job submitted: {job_file}")
         decon_status = bool(args.psf)
         print(
@@ -173,6 +229,7 @@ def main():
             f"Angle={args.angle}, Decon={decon_status}"
         )
     except Exception as e:
+        tmp_file.unlink(missing_ok=True)
         print(f"Failed to write job ticket: {e}")
         sys.exit(1)
 
@@ -5,9 +5,12 @@ Core utilities, definitions, and path helpers for the OPM Cropper.
 
 from __future__ import annotations
 
+import fnmatch
+import os
 import re
 from dataclasses import dataclass
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
 from typing import Literal
 
@@ -26,6 +29,28 @@ class OutputFormat(str, Enum):
 
 MicroscopyDataType = Literal["LLSM", "OPM", "UNKNOWN"]
 
+_ROI_STRING_RE = re.compile(r"^(\d+):(\d+),\s*(\d+):(\d+)$")
+
+# File name patterns used to recognise each data type (glob syntax)
+_OPM_FILE_RE = re.compile(fnmatch.translate("*_C[0-9]_T[0-9][0-9][0-9].tif"))
+_LLSM_FILE_RE = re.compile(
+    fnmatch.translate("*_Cam[AB]_ch[0-9]_stack[0-9][0-9][0-9][0-9]*.tif")
+)
+
+
+def _dir_cache_key(directory: Path) -> tuple[str, int]:
+    """
+    Returns (absolute path, mtime_ns) keying the directory-listing caches
+    below. os.path.abspath avoids resolve()'s per-component stats on
+    parallel filesystems, at the cost of symlinked aliases caching apart.
+
+    A directory's mtime changes only when direct entries are added, removed
+    or renamed, which is all these scans look at; subdirectories and file
+    contents are not considered.
+    """
+    dir_str = os.path.abspath(directory)
+    return dir_str, os.stat(dir_str).st_mtime_ns
+
 
 def detect_microscopy_data_type(directory: Path) -> MicroscopyDataType:
     """
@@ -40,18 +65,23 @@ def detect_microscopy_data_type(directory: Path) -> MicroscopyDataType:
     if not directory.is_dir():
         raise NotADirectoryError(f"Path is not a directory: {directory}")
 
-    # --- MODIFICATION: Check for OPM using the new C..._T... format ---
-    if next(directory.glob("*_C[0-9]_T[0-9][0-9][0-9].tif"), None):
-        return "OPM"
+    return _detect_data_type_cached(*_dir_cache_key(directory))
+
 
-    # Check for LLSM
-    if next(
-        directory.glob("*_Cam[AB]_ch[0-9]_stack[0-9][0-9][0-9][0-9]*.tif"),
-        None,
-    ):
-        return "LLSM"
+@lru_cache(maxsize=64)
+def _detect_data_type_cached(dir_str: str, mtime_ns: int) -> MicroscopyDataType:
+    """Cached worker for detect_microscopy_data_type."""
+    # One listing for both checks. OPM (the C..._T... format) takes priority,
+    # so stop at the first OPM file; an LLSM hit only decides the fallback.
+    found_llsm = False
+    with os.scandir(dir_str) as entries:
+        for entry in entries:
+            if _OPM_FILE_RE.match(entry.name):
+                return "OPM"
+            if not found_llsm and _LLSM_FILE_RE.match(entry.name):
+                found_llsm = True
 
-    return "UNKNOWN"
+    return "LLSM" if found_llsm else "UNKNOWN"
 
 
 @dataclass(frozen=True)
@@ -65,15 +95,20 @@ class DerivedPaths:
     sanitized_name: str
 
 
+def _strip_ome_suffix(name: str) -> str:
+    """Removes a trailing .ome.tif."""
+    return name[:-8] if name.endswith(".ome.tif") else name
+
+
 def sanitize_filename(name: str) -> str:
     """Removes .ome.tif and replaces spaces."""
-    return name.replace(".ome.tif", "").replace(" ", "_")
+    return _strip_ome_suffix(name).replace(" ", "_")
 
 
 def derive_paths(base_file: Path, output_format: OutputFormat) -> DerivedPaths:
     """Derives all associated input and output paths from the base file."""
-    base_name_no_ext = base_file.name.replace(".ome.tif", "")
-    sanitized_name = sanitize_filename(base_file.name)
+    base_name_no_ext = _strip_ome_suffix(base_file.name)
+    sanitized_name = base_name_no_ext.replace(" ", "_")
     metadata_file = base_file.parent / (base_name_no_ext + "_metadata.txt")
 
     if output_format == OutputFormat.ZARR:
@@ -98,14 +133,13 @@ def parse_roi_string(roi_str: str) -> tuple[slice, slice]:
     Parses a CLI string like "y1:y2, x1:x2" into a NumPy slice.
     e.g., "0:512, 0:512" -> (slice(0, 512), slice(0, 512))
     """
-    if not re.match(r"^\d+:\d+,\s*\d+:\d+$", roi_str):
+    match = _ROI_STRING_RE.match(roi_str)
+    if not match:
         raise ValueError(
             f"Invalid ROI format: '{roi_str}'. Expected 'y_start:y_stop,x_start:x_stop'"
         )
 
-    y_str, x_str = roi_str.split(",")
-    y_start, y_stop = map(int, y_str.strip().split(":"))
-    x_start, x_stop = map(int, x_str.strip().split(":"))
+    y_start, y_stop, x_start, x_stop = map(int, match.groups())
 
     return (slice(y_start, y_stop), slice(x_start, x_stop))
 
@@ -138,12 +172,18 @@ def scan_channel_patterns(directory: Path) -> str:
     if not directory.is_dir():
         return ""
 
+    return _scan_channel_patterns_cached(*_dir_cache_key(directory))
+
+
+@lru_cache(maxsize=64)
+def _scan_channel_patterns_cached(dir_str: str, mtime_ns: int) -> str:
+    """Cached worker for scan_channel_patterns, keyed on the directory mtime."""
     patterns = set()
     # Looking for _C followed by digits (standard for deinterlaced OPM)
     # or Cam[AB] (Standard for PetaKit/LLSM)
     file_re = re.compile(r".*?(_C\d+|Cam[AB]).*?", re.IGNORECASE)
 
-    for f in directory.glob("*.tif"):
+    for f in Path(dir_str).glob("*.tif"):
         match = file_re.search(f.name)
         if match:
             patterns.add(match.group(1))